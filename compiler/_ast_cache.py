@@ -0,0 +1,175 @@
+"""
+On-disk cache of parsed ROI-DSL ASTs and the results derived from them
+Entries are keyed by a content digest of the source text together with the compiler
+version, the Python version and the parser, validator and interpreter modules,
+so a cached entry is only reused for byte-identical input handled by the same code.
+Each entry holds the AST and, once computed, its validation and analysis.
+Entries live in a per-user cache directory (ROI_DSL_CACHE_DIR overrides it),
+never next to the installed package: loading one unpickles it, so only the
+user running the compiler should be able to write there.
+"""
+
+import copy
+import os
+import pickle
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from . import __version__
+from . import interpreter as _interpreter_module
+from . import parser as _parser_module
+from . import validator as _validator_module
+from ._hash import digest
+from .interpreter import ROIInterpreter
+from .parser import ROIDSLParser, ROIDSLAST
+from .validator import ROIValidator
+
+
+def default_cache_dir() -> Path:
+    """Per-user directory for cached entries"""
+    override = os.environ.get('ROI_DSL_CACHE_DIR')
+    if override:
+        return Path(override)
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local'
+    elif sys.platform == 'darwin':
+        base = Path.home() / 'Library' / 'Caches'
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'roi-dsl' / 'ast'
+
+
+def _module_stamp(module) -> str:
+    """Identify a module's build, so edits to it invalidate cached entries"""
+    try:
+        stat = os.stat(module.__file__)
+    except (OSError, TypeError):
+        return "0"
+    return f"{stat.st_mtime_ns:x}{stat.st_size:x}"
+
+
+# Everything other than the source that decides what an entry holds
+_CACHE_SALT = "-".join([
+    __version__,
+    f"py{sys.version_info[0]}{sys.version_info[1]}",
+    *(_module_stamp(m) for m in (_parser_module, _validator_module, _interpreter_module)),
+])
+
+
+class ASTCache:
+    """Parse, validate and analyze ROI-DSL source, reusing results from earlier runs"""
+    
+    def __init__(self, cache_dir: Optional[Path] = None, max_entries: int = 32,
+                 max_disk_entries: int = 256):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.misses = 0
+        # Recently used entries by source digest, so validate()/analyze()
+        # after parse() do not go back to disk
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+    
+    def parse(self, source: str, source_digest: Optional[str] = None) -> ROIDSLAST:
+        """Return the AST for source, from the cache when possible"""
+        if source_digest is None:
+            source_digest = digest(source.encode('utf-8'))
+        
+        entry = self._entries.get(source_digest)
+        if entry is not None:
+            self._entries.move_to_end(source_digest)
+            self.hits += 1
+            return entry['ast']
+        
+        try:
+            with open(self._path(source_digest), 'rb') as f:
+                entry = pickle.load(f)
+        except Exception:
+            # Missing, truncated or written by an incompatible build
+            entry = None
+        
+        if isinstance(entry, dict) and isinstance(entry.get('ast'), ROIDSLAST):
+            self.hits += 1
+        else:
+            self.misses += 1
+            entry = {'ast': ROIDSLParser(source).parse()}
+            self._store(source_digest, entry)
+        
+        self._remember(source_digest, entry)
+        return entry['ast']
+    
+    def validate(self, ast: ROIDSLAST, source_digest: str) -> Dict[str, Any]:
+        """ROIValidator result for ast, the AST parse() returned for source_digest"""
+        return self._derived(source_digest, 'validation', lambda: ROIValidator(ast).validate())
+    
+    def analyze(self, ast: ROIDSLAST, source_digest: str) -> Dict[str, Any]:
+        """ROIInterpreter analysis of ast, the AST parse() returned for source_digest"""
+        # Keyed by digest rather than by the AST itself: ROIDSLAST is a slotted,
+        # value-compared dataclass, so it can be neither hashed nor weakly referenced
+        return self._derived(source_digest, 'analysis', lambda: ROIInterpreter(ast).analyze())
+    
+    def _derived(self, source_digest: str, key: str, compute) -> Dict[str, Any]:
+        """
+        Cached result stored under key in the entry, computing it on a miss
+        Callers get their own copy, so changing it leaves the entry intact.
+        """
+        entry = self._entries.get(source_digest)
+        if entry is not None and key in entry:
+            return copy.deepcopy(entry[key])
+        
+        result = compute()
+        if entry is not None:
+            entry[key] = result
+            self._store(source_digest, entry)
+            return copy.deepcopy(result)
+        return result
+    
+    def _remember(self, source_digest: str, entry: dict) -> None:
+        self._entries[source_digest] = entry
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def _path(self, source_digest: str) -> Path:
+        return self.cache_dir / f"{source_digest}-{_CACHE_SALT}.pkl"
+    
+    def _store(self, source_digest: str, entry: dict) -> None:
+        """Write an entry atomically; the cache is best-effort"""
+        path = self._path(source_digest)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            # Private to the user, since entries are unpickled on load
+            path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            with open(tmp, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except Exception:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return
+        self._prune()
+    
+    def _prune(self) -> None:
+        """Delete entries from other builds and all but the newest on disk"""
+        current = []
+        suffix = f"-{_CACHE_SALT}.pkl"
+        try:
+            for path in self.cache_dir.glob("*.pkl"):
+                if path.name.endswith(suffix):
+                    current.append((path.stat().st_mtime_ns, path))
+                else:
+                    # Written under an older salt; never read again
+                    path.unlink()
+        except OSError:
+            # Entries removed by a concurrent compile; prune next time
+            return
+        
+        current.sort(reverse=True)
+        for _, path in current[self.max_disk_entries:]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,58 @@
+"""
+Output cache shared by the transpilers
+Each transpiler keeps its recently serialized outputs keyed by a fingerprint
+of the AST fields it reads, so re-transpiling an identical definition - as
+watch mode does on every save - returns the earlier text.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+# Number of distinct ASTs whose compiled output each transpiler keeps
+CACHE_SIZE = 32
+
+# AST field -> hashable view of it. repr() keeps metric values that compare
+# equal but serialize differently (1 vs 1.0, 0.0 vs -0.0) apart; case studies
+# keep insertion order because the first one drives the SDR emails.
+_FIELD_KEYS: Dict[str, Callable[[Any], Any]] = {
+    'persona': lambda ast: (ast.persona.name, ast.persona.value) if ast.persona else None,
+    'goals': lambda ast: tuple((g.name, g.value) for g in ast.goals),
+    'metrics': lambda ast: tuple((m.name, repr(m.value)) for m in ast.metrics),
+    'rmetrics': lambda ast: tuple((r.name, r.expr) for r in ast.rmetrics),
+    'triggers': lambda ast: tuple((t.condition, t.action) for t in ast.triggers),
+    'variants': lambda ast: tuple((v.type, v.value) for v in ast.variants),
+    'case_studies': lambda ast: tuple(ast.case_studies.items()),
+}
+
+
+class OutputCache:
+    """Least-recently-used map from an AST fingerprint to its compiled output"""
+    
+    __slots__ = ('_keys', '_entries', '_maxsize')
+    
+    def __init__(self, fields: Tuple[str, ...], maxsize: int = CACHE_SIZE) -> None:
+        # fields lists every AST field the transpiler's output depends on
+        self._keys = tuple(_FIELD_KEYS[field] for field in fields)
+        self._entries: "OrderedDict[tuple, str]" = OrderedDict()
+        self._maxsize = maxsize
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def fingerprint(self, ast) -> tuple:
+        """The fields this cache was built for, as a hashable key"""
+        return tuple(key(ast) for key in self._keys)
+    
+    def get(self, ast, compile: Callable[[Any], str]) -> str:
+        """compile(ast), or the cached output of an identical earlier AST"""
+        key = self.fingerprint(ast)
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._entries.move_to_end(key)
+            return cached
+        
+        result = compile(ast)
+        self._entries[key] = result
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+        return result
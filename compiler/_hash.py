@@ -0,0 +1,23 @@
+"""
+Content hashing for cache keys and change detection
+Uses xxhash's XXH3-128 when it is installed and falls back to SHA-256 from
+the stdlib. The two produce digests of different lengths, so keys written by
+one never match keys written by the other.
+"""
+
+try:
+    import xxhash  # type: ignore[import-not-found, unused-ignore]
+except ImportError:
+    xxhash = None  # type: ignore[assignment, unused-ignore]
+
+import hashlib
+
+
+if xxhash is not None:
+    def digest(data: bytes) -> str:
+        """Hex digest identifying data's content"""
+        return xxhash.xxh3_128_hexdigest(data)
+else:
+    def digest(data: bytes) -> str:
+        """Hex digest identifying data's content"""
+        return hashlib.sha256(data).hexdigest()
@@ -0,0 +1,44 @@
+"""
+JSON serialization for transpiler outputs
+Uses orjson when it is installed and falls back to the stdlib json module.
+Both paths emit 2-space indented text with non-ASCII characters kept as-is,
+but floats can differ: orjson writes exponents without padding (1e16, 1e-8
+where json writes 1e+16, 1e-08) and NaN/Infinity as null, which json emits
+as the non-standard NaN/Infinity literals. Outputs holding such values
+depend on whether orjson is installed.
+"""
+
+try:
+    import orjson  # type: ignore[import-not-found, unused-ignore]
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+import json
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj) -> str:
+        """Serialize obj to indented JSON text"""
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode('utf-8')
+
+    def dumps_bytes(obj) -> bytes:
+        """Serialize obj to indented UTF-8 JSON"""
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+
+    def dump(obj, fp) -> None:
+        """Serialize obj as indented JSON to an open text file"""
+        fp.write(dumps(obj))
+else:
+    def dumps(obj) -> str:
+        """Serialize obj to indented JSON text"""
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+    def dumps_bytes(obj) -> bytes:
+        """Serialize obj to indented UTF-8 JSON"""
+        return dumps(obj).encode('utf-8')
+
+    def dump(obj, fp) -> None:
+        """Serialize obj as indented JSON to an open text file, chunk by chunk"""
+        json.dump(obj, fp, indent=2, ensure_ascii=False)
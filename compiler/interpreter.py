@@ -3,12 +3,31 @@ ROI-DSL Interpreter v2.1
 Analyzes AST and extracts business insights
 """
 
+import copy
+from functools import cached_property
 from typing import Dict, Any, List
 import re
 
 
+# Keyword scans compiled once as single alternations
+_PRIMARY_GOAL_RE = re.compile(r'avoid|save|reduce|prevent', re.I)
+_RISK_RE = re.compile(r'risk|drift|delay|variance', re.I)
+_COST_MARKER_RE = re.compile(r'\$|M/|million|delay')
+_PAIN_RE = re.compile(r'avoid|prevent|reduce|eliminate|fix|stop|control|regain|restore|recover', re.I)
+
+# Dollar amounts like $2M, $1.8M, $500K
+_DOLLAR_RE = re.compile(r'\$(\d+\.?\d*)\s*([MK])')
+_DOLLAR_MULT = {'M': 1_000_000, 'K': 1_000}
+
+
 class ROIInterpreter:
-    """Interprets ROI-DSL AST to extract business value insights"""
+    """
+    Interprets ROI-DSL AST to extract business value insights
+    
+    Derived values are computed once per interpreter and cached, so the AST
+    must not be mutated after construction - build a new ROIInterpreter
+    for a changed AST instead.
+    """
     
     def __init__(self, ast):
         self.ast = ast
@@ -16,18 +35,24 @@ class ROIInterpreter:
     def analyze(self) -> Dict[str, Any]:
         """
         Perform semantic analysis on the AST
-        Returns insights about the value framework
+        Returns insights about the value framework; the result is a copy the
+        caller may modify.
         """
+        return copy.deepcopy(self.analysis)
+    
+    @cached_property
+    def analysis(self) -> Dict[str, Any]:
+        """Analysis result, computed on first access and shared by analyze()/generate_summary()"""
         analysis = {
             'persona': self._get_persona_summary(),
-            'primary_goal': self._get_primary_goal(),
+            'primary_goal': self._primary_goal,
             'secondary_goals': self._get_secondary_goals(),
-            'risk_score': self._calculate_risk_score(),
+            'risk_score': self._risk_score,
             'urgency_level': self._assess_urgency(),
-            'value_proposition': self._extract_value_prop(),
+            'value_proposition': self._value_prop,
             'automation_triggers': self._count_triggers(),
             'output_type': self.ast.output,
-            'completeness_score': self._assess_completeness(),
+            'completeness_score': self._completeness,
         }
         
         return analysis
@@ -38,54 +63,61 @@ class ROIInterpreter:
             return f"{self.ast.persona.name}: {self.ast.persona.value}"
         return "No persona defined"
     
-    def _get_primary_goal(self) -> str:
-        """Identify the primary goal (typically first or highest value)"""
-        if not self.ast.goals:
-            return "No goals defined"
-        
+    @cached_property
+    def _primary_goal_index(self) -> int:
+        """Index of the primary goal (typically first or highest value)"""
         # Look for cost-related goals first (highest urgency)
-        for goal in self.ast.goals:
-            if any(word in goal.value.lower() for word in ['avoid', 'save', 'reduce', 'prevent']):
-                return f"{goal.name}: {goal.value}"
+        for i, goal in enumerate(self.ast.goals):
+            if _PRIMARY_GOAL_RE.search(goal.value):
+                return i
         
-        # Otherwise return first goal
-        return f"{self.ast.goals[0].name}: {self.ast.goals[0].value}"
+        # Otherwise use first goal
+        return 0
+    
+    @cached_property
+    def _primary_goal(self) -> str:
+        """Primary goal formatted as 'Name: value'"""
+        if not self.ast.goals:
+            return "No goals defined"
+        goal = self.ast.goals[self._primary_goal_index]
+        return f"{goal.name}: {goal.value}"
     
     def _get_secondary_goals(self) -> List[str]:
         """Get all non-primary goals"""
         if len(self.ast.goals) <= 1:
             return []
         
-        primary = self._get_primary_goal().split(':')[0]
-        return [f"{g.name}: {g.value}" for g in self.ast.goals if g.name != primary]
+        primary = self._primary_goal_index
+        return [f"{g.name}: {g.value}" for i, g in enumerate(self.ast.goals) if i != primary]
     
-    def _calculate_risk_score(self) -> float:
+    @cached_property
+    def _risk_score(self) -> float:
         """Calculate overall risk score from metrics"""
         if not self.ast.metrics:
             return 0.0
         
-        risk_metrics = []
-        
+        # One pass accumulates both the risk-related and the overall totals
+        total = 0.0
+        risk_total = 0.0
+        risk_count = 0
         for metric in self.ast.metrics:
-            # Identify risk-related metrics
-            if any(word in metric.name.lower() for word in ['risk', 'drift', 'delay', 'variance']):
-                risk_metrics.append(metric.value)
+            total += metric.value
+            if _RISK_RE.search(metric.name):
+                risk_total += metric.value
+                risk_count += 1
         
-        if not risk_metrics:
+        if not risk_count:
             # Use average of all metrics as fallback
-            risk_metrics = [m.value for m in self.ast.metrics]
+            return round(total / len(self.ast.metrics), 2)
         
-        return round(sum(risk_metrics) / len(risk_metrics), 2)
+        return round(risk_total / risk_count, 2)
     
     def _assess_urgency(self) -> str:
         """Assess urgency level based on goals and metrics"""
-        risk_score = self._calculate_risk_score()
+        risk_score = self._risk_score
         
         # Check for high-value cost avoidance
-        has_high_cost = any(
-            any(marker in goal.value for marker in ['$', 'M/', 'million', 'delay'])
-            for goal in self.ast.goals
-        )
+        has_high_cost = any(_COST_MARKER_RE.search(goal.value) for goal in self.ast.goals)
         
         if risk_score > 0.6 and has_high_cost:
             return "CRITICAL"
@@ -96,7 +128,8 @@ class ROIInterpreter:
         else:
             return "LOW"
     
-    def _extract_value_prop(self) -> str:
+    @cached_property
+    def _value_prop(self) -> str:
         """Extract the core value proposition"""
         if not self.ast.goals:
             return "No value proposition defined"
@@ -113,7 +146,8 @@ class ROIInterpreter:
         """Count automation triggers"""
         return len(self.ast.triggers)
     
-    def _assess_completeness(self) -> float:
+    @cached_property
+    def _completeness(self) -> float:
         """
         Assess how complete/well-defined the ROI-DSL file is
         Returns 0.0 to 1.0
@@ -157,7 +191,7 @@ class ROIInterpreter:
     
     def generate_summary(self) -> str:
         """Generate a human-readable summary"""
-        analysis = self.analyze()
+        analysis = self.analysis
         
         summary = []
         summary.append(f"=== ROI-DSL Analysis Summary ===\n")
@@ -181,17 +215,11 @@ class ROIInterpreter:
     
     def extract_dollar_values(self) -> List[float]:
         """Extract all dollar values from goals"""
-        dollar_values = []
-        
-        for goal in self.ast.goals:
-            # Match patterns like $2M, $1.8M, $500K, etc.
-            matches = re.findall(r'\$(\d+\.?\d*)\s*([MK])', goal.value)
-            for match in matches:
-                amount = float(match[0])
-                multiplier = 1_000_000 if match[1] == 'M' else 1_000
-                dollar_values.append(amount * multiplier)
-        
-        return dollar_values
+        return [
+            float(amount) * _DOLLAR_MULT[suffix]
+            for goal in self.ast.goals
+            for amount, suffix in _DOLLAR_RE.findall(goal.value)
+        ]
     
     def calculate_total_value(self) -> float:
         """Calculate total quantified value across all goals"""
@@ -200,19 +228,7 @@ class ROIInterpreter:
     
     def identify_pain_points(self) -> List[str]:
         """Identify pain points from goals"""
-        pain_indicators = [
-            'avoid', 'prevent', 'reduce', 'eliminate', 'fix',
-            'stop', 'control', 'regain', 'restore', 'recover'
-        ]
-        
-        pain_points = []
-        
-        for goal in self.ast.goals:
-            goal_lower = goal.value.lower()
-            if any(indicator in goal_lower for indicator in pain_indicators):
-                pain_points.append(goal.value)
-        
-        return pain_points
+        return [goal.value for goal in self.ast.goals if _PAIN_RE.search(goal.value)]
     
     def suggest_improvements(self) -> List[str]:
         """Suggest improvements to the ROI-DSL file"""
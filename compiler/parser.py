@@ -1,51 +1,105 @@
 """
 ROI-DSL Parser v2.1
 Converts .roi text files into Abstract Syntax Tree (AST)
+The grammar is one block per line, so parsing is a keyword dispatch per line
+rather than a generated LALR parser; it runs at about a microsecond per line
+and needs no third-party packages.
 """
 
 import re
+import sys
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Iterable, Pattern, Tuple, Union
+
+
+# Precompiled block patterns - compiled once at import instead of per line
+_PERSONA_RE = re.compile(r'PERSONA\s+(\w+)\s*:\s*"([^"]+)"')
+_CREDENTIAL_RE = re.compile(r'CREDENTIAL\s+(\w+)\s*:\s*"([^"]+)"')
+_CASE_STUDY_RE = re.compile(r'CASE_STUDY\s+(\w+)\s*:\s*"([^"]+)"')
+_SERVICE_RE = re.compile(r'SERVICE\s+(\w+)\s*:\s*"([^"]+)"')
+_TRAINING_RE = re.compile(r'TRAINING\s+(\w+)\s*:\s*"([^"]+)"')
+_VROI_INPUT_RE = re.compile(r'VROI_INPUT\s+(\w+)\s*:\s*"([^"]+)"')
+_VROI_OUTPUT_RE = re.compile(r'VROI_OUTPUT\s+(\w+)\s*:\s*"([^"]+)"')
+_STAT_RE = re.compile(r'STAT\s+(\w+)\s*:\s*"([^"]+)"')
+_MICROTRAINING_RE = re.compile(r'MICROTRAINING\s+(\w+)\s*:\s*"([^"]+)"')
+_SEO_RE = re.compile(r'SEO_(\w+)\s*:\s*"([^"]+)"')
+_CONTACT_RE = re.compile(r'CONTACT_(\w+)\s*:\s*"([^"]+)"')
+_SK_TAG_RE = re.compile(r'SK_TAG\s*:\s*"([^"]+)"')
+_GOAL_RE = re.compile(r'GOAL\s+(\w+)\s*:\s*"([^"]+)"')
+_METRIC_RE = re.compile(r'METRIC\s+(\w+)\s*:\s*([\d.]+)')
+_RMETRIC_RE = re.compile(r'RMetric\s+(\w+)\s*:\s*"([^"]+)"')
+_TRIGGER_RE = re.compile(r'WHEN\s+(.+?)\s+THEN\s+(.+)')
+_VARIANT_RE = re.compile(r'VARIANT\s+(\w+)\s*:\s*"([^"]+)"')
+_OUTPUT_RE = re.compile(r'OUTPUT\s+(\w+)')
+
+# Accepted OUTPUT targets, in the order listed in error messages
+_VALID_OUTPUTS = ('SMS_CAMPAIGN', 'AGENT', 'RMetrics', 'vROI', 'MintSite', 'SK_SKILL')
+
+
+def _split_kv(line: str, keyword_len: int, spaced: bool = True) -> Optional[Tuple[str, str]]:
+    """
+    Fast scan of a 'KEYWORD Name: "value"' line using plain string ops
+    Returns (name, value), or None when the line is not in the exact form
+    (callers fall back to the block regex for those lines).
+    """
+    head, sep, rest = line.partition(':')
+    if not sep:
+        return None
+    
+    name_part = head[keyword_len:]
+    # Keyword blocks need whitespace before the name, SEO_/CONTACT_ none
+    if name_part[:1].isspace() != spaced:
+        return None
+    name = name_part.strip()
+    if not name or not name.replace('_', 'a').isalnum():
+        return None
+    
+    rest = rest.lstrip()
+    end = rest.find('"', 1)
+    if not rest.startswith('"') or end < 2:
+        return None
+    
+    return name, rest[1:end]
 
 
 # AST Node Classes
-@dataclass
+@dataclass(slots=True)
 class PersonaNode:
     name: str
     value: str
 
 
-@dataclass
+@dataclass(slots=True)
 class GoalNode:
     name: str
     value: str
 
 
-@dataclass
+@dataclass(slots=True)
 class MetricNode:
     name: str
     value: float
 
 
-@dataclass
+@dataclass(slots=True)
 class RMetricNode:
     name: str
     expr: str
 
 
-@dataclass
+@dataclass(slots=True)
 class TriggerNode:
     condition: str
     action: str
 
 
-@dataclass
+@dataclass(slots=True)
 class VariantNode:
     type: str  # Hero, Resume, CTA
     value: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ROIDSLAST:
     """Root AST node for ROI-DSL file"""
     persona: Optional[PersonaNode] = None
@@ -67,82 +121,58 @@ class ROIDSLAST:
     contact: Dict[str, str] = field(default_factory=dict)
     sk_tags: List[str] = field(default_factory=list)
     output: Optional[str] = None
+    # Name lookups maintained by the parser alongside goals/metrics
+    metrics_by_name: Dict[str, float] = field(default_factory=dict, repr=False, compare=False)
+    goals_by_name: Dict[str, str] = field(default_factory=dict, repr=False, compare=False)
 
 
 class ROIDSLParser:
     """Parser for ROI-DSL v2"""
     
-    def __init__(self, text: str):
+    def __init__(self, text: Union[str, Iterable[str]]):
+        # text is either the full source or an iterable of lines (e.g. an open file)
         self.text = text
-        self.lines = [line.strip() for line in text.split('\n') if line.strip()]
-        self.current_line = 0
         self.ast = ROIDSLAST()
     
     def parse(self) -> ROIDSLAST:
-        """Parse the entire ROI-DSL file"""
-        while self.current_line < len(self.lines):
-            line = self.lines[self.current_line]
+        """Parse the entire ROI-DSL file in a single pass over the source"""
+        lines = self.text.split('\n') if isinstance(self.text, str) else self.text
+        for lineno, raw in enumerate(lines, 1):
+            line = raw.strip()
             
-            # Skip comments
-            if line.startswith('#') or line.startswith('//'):
-                self.current_line += 1
+            # Skip blank lines and comments
+            if not line or line[0] == '#' or line.startswith('//'):
                 continue
             
-            # Parse each block type
-            if line.startswith('PERSONA'):
-                self._parse_persona(line)
-            elif line.startswith('GOAL'):
-                self._parse_goal(line)
-            elif line.startswith('METRIC') and not line.startswith('RMetric'):
-                self._parse_metric(line)
-            elif line.startswith('RMetric'):
-                self._parse_rmetric(line)
-            elif line.startswith('WHEN'):
-                self._parse_trigger(line)
-            elif line.startswith('VARIANT'):
-                self._parse_variant(line)
-            elif line.startswith('CREDENTIAL'):
-                self._parse_credential(line)
-            elif line.startswith('CASE_STUDY'):
-                self._parse_case_study(line)
-            elif line.startswith('SERVICE'):
-                self._parse_service(line)
-            elif line.startswith('TRAINING'):
-                self._parse_training(line)
-            elif line.startswith('VROI_INPUT'):
-                self._parse_vroi_input(line)
-            elif line.startswith('VROI_OUTPUT'):
-                self._parse_vroi_output(line)
-            elif line.startswith('STAT'):
-                self._parse_stat(line)
-            elif line.startswith('MICROTRAINING'):
-                self._parse_microtraining(line)
-            elif line.startswith('SEO_'):
-                self._parse_seo(line)
-            elif line.startswith('CONTACT_'):
-                self._parse_contact(line)
-            elif line.startswith('SK_TAG'):
-                self._parse_sk_tag(line)
-            elif line.startswith('OUTPUT'):
-                self._parse_output(line)
-            else:
-                raise SyntaxError(f"Unknown syntax at line {self.current_line + 1}: {line}")
-            
-            self.current_line += 1
+            # Dispatch on the leading keyword (SEO_*/CONTACT_* match by prefix)
+            keyword = line.split(None, 1)[0].partition(':')[0]
+            handler = _DISPATCH.get(keyword)
+            if handler is None:
+                prefix, sep, _ = keyword.partition('_')
+                handler = _PREFIX_DISPATCH.get(prefix) if sep else None
+            if handler is None:
+                raise SyntaxError(f"Unknown syntax at line {lineno}: {line}")
+            handler(self, line)
         
         return self.ast
     
+    def _split_block(self, line: str, keyword: str, pattern: Pattern) -> Tuple[str, str]:
+        """
+        Split a 'KEYWORD Name: "value"' block, falling back to its regex
+        Names are interned since they are reused as dict keys downstream.
+        """
+        parts = _split_kv(line, len(keyword), spaced=not keyword.endswith('_'))
+        if parts is None:
+            match = pattern.match(line)
+            if not match:
+                raise SyntaxError(f"Invalid {keyword.rstrip('_')} syntax: {line}")
+            parts = match.group(1), match.group(2)
+        return sys.intern(parts[0]), parts[1]
+    
     def _parse_persona(self, line: str):
         """Parse PERSONA block - support multiple personas"""
         # PERSONA Sponsor: "CNS Phase III Director"
-        pattern = r'PERSONA\s+(\w+)\s*:\s*"([^"]+)"'
-        match = re.match(pattern, line)
-        
-        if not match:
-            raise SyntaxError(f"Invalid PERSONA syntax: {line}")
-        
-        name = match.group(1)
-        value = match.group(2)
+        name, value = self._split_block(line, 'PERSONA', _PERSONA_RE)
         
         persona_node = PersonaNode(name=name, value=value)
         
@@ -156,138 +186,67 @@ class ROIDSLParser:
     def _parse_credential(self, line: str):
         """Parse CREDENTIAL block"""
         # CREDENTIAL Sites: "536+ Sites Managed"
-        pattern = r'CREDENTIAL\s+(\w+)\s*:\s*"([^"]+)"'
-        match = re.match(pattern, line)
-        
-        if not match:
-            raise SyntaxError(f"Invalid CREDENTIAL syntax: {line}")
-        
-        key = match.group(1)
-        value = match.group(2)
+        key, value = self._split_block(line, 'CREDENTIAL', _CREDENTIAL_RE)
         self.ast.credentials[key] = value
     
     def _parse_case_study(self, line: str):
         """Parse CASE_STUDY block"""
         # CASE_STUDY Asubio: "COPD Phase IIb – 40 Sites..."
-        pattern = r'CASE_STUDY\s+(\w+)\s*:\s*"([^"]+)"'
-        match = re.match(pattern, line)
-        
-        if not match:
-            raise SyntaxError(f"Invalid CASE_STUDY syntax: {line}")
-        
-        key = match.group(1)
-        value = match.group(2)
+        key, value = self._split_block(line, 'CASE_STUDY', _CASE_STUDY_RE)
         self.ast.case_studies[key] = value
     
     def _parse_service(self, line: str):
         """Parse SERVICE block"""
         # SERVICE CriticalPath: "Critical-Path Turnaround – Rescue delayed trials"
-        pattern = r'SERVICE\s+(\w+)\s*:\s*"([^"]+)"'
-        match = re.match(pattern, line)
-        
-        if not match:
-            raise SyntaxError(f"Invalid SERVICE syntax: {line}")
-        
-        key = match.group(1)
-        value = match.group(2)
+        key, value = self._split_block(line, 'SERVICE', _SERVICE_RE)
         self.ast.services[key] = value
     
     def _parse_training(self, line: str):
         """Parse TRAINING block"""
         # TRAINING MonitoringRisk: "Monitoring for Risk – Proactive detection"
-        pattern = r'TRAINING\s+(\w+)\s*:\s*"([^"]+)"'
-        match = re.match(pattern, line)
-        
-        if not match:
-            raise SyntaxError(f"Invalid TRAINING syntax: {line}")
-        
-        key = match.group(1)
-        value = match.group(2)
+        key, value = self._split_block(line, 'TRAINING', _TRAINING_RE)
         self.ast.training[key] = value
     
     def _parse_vroi_input(self, line: str):
         """Parse VROI_INPUT block"""
         # VROI_INPUT StudyPhase: "Phase (I / II / III / PM)"
-        pattern = r'VROI_INPUT\s+(\w+)\s*:\s*"([^"]+)"'
-        match = re.match(pattern, line)
-        
-        if not match:
-            raise SyntaxError(f"Invalid VROI_INPUT syntax: {line}")
-        
-        key = match.group(1)
-        value = match.group(2)
+        key, value = self._split_block(line, 'VROI_INPUT', _VROI_INPUT_RE)
         self.ast.vroi_inputs[key] = value
     
     def _parse_vroi_output(self, line: str):
         """Parse VROI_OUTPUT block"""
         # VROI_OUTPUT DelayCost: "Cost of Delay (Monthly)"
-        pattern = r'VROI_OUTPUT\s+(\w+)\s*:\s*"([^"]+)"'
-        match = re.match(pattern, line)
-        
-        if not match:
-            raise SyntaxError(f"Invalid VROI_OUTPUT syntax: {line}")
-        
-        key = match.group(1)
-        value = match.group(2)
+        key, value = self._split_block(line, 'VROI_OUTPUT', _VROI_OUTPUT_RE)
         self.ast.vroi_outputs[key] = value
     
     def _parse_stat(self, line: str):
         """Parse STAT block"""
         # STAT Sites: "536 Sites"
-        pattern = r'STAT\s+(\w+)\s*:\s*"([^"]+)"'
-        match = re.match(pattern, line)
-        
-        if not match:
-            raise SyntaxError(f"Invalid STAT syntax: {line}")
-        
-        key = match.group(1)
-        value = match.group(2)
+        key, value = self._split_block(line, 'STAT', _STAT_RE)
         self.ast.stats[key] = value
     
     def _parse_microtraining(self, line: str):
         """Parse MICROTRAINING block"""
         # MICROTRAINING Title: "See the CRO Precision Method"
-        pattern = r'MICROTRAINING\s+(\w+)\s*:\s*"([^"]+)"'
-        match = re.match(pattern, line)
-        
-        if not match:
-            raise SyntaxError(f"Invalid MICROTRAINING syntax: {line}")
-        
-        key = match.group(1)
-        value = match.group(2)
+        key, value = self._split_block(line, 'MICROTRAINING', _MICROTRAINING_RE)
         self.ast.microtraining[key] = value
     
     def _parse_seo(self, line: str):
         """Parse SEO_* block"""
         # SEO_TITLE: "Rose Maloney - Clinical Operations Expert"
-        pattern = r'SEO_(\w+)\s*:\s*"([^"]+)"'
-        match = re.match(pattern, line)
-        
-        if not match:
-            raise SyntaxError(f"Invalid SEO syntax: {line}")
-        
-        key = match.group(1)
-        value = match.group(2)
+        key, value = self._split_block(line, 'SEO_', _SEO_RE)
         self.ast.seo[key] = value
     
     def _parse_contact(self, line: str):
         """Parse CONTACT_* block"""
         # CONTACT_NAME: "Rose Maloney"
-        pattern = r'CONTACT_(\w+)\s*:\s*"([^"]+)"'
-        match = re.match(pattern, line)
-        
-        if not match:
-            raise SyntaxError(f"Invalid CONTACT syntax: {line}")
-        
-        key = match.group(1)
-        value = match.group(2)
+        key, value = self._split_block(line, 'CONTACT_', _CONTACT_RE)
         self.ast.contact[key] = value
     
     def _parse_sk_tag(self, line: str):
         """Parse SK_TAG block"""
         # SK_TAG: "clinical_operations_expert"
-        pattern = r'SK_TAG\s*:\s*"([^"]+)"'
-        match = re.match(pattern, line)
+        match = _SK_TAG_RE.match(line)
         
         if not match:
             raise SyntaxError(f"Invalid SK_TAG syntax: {line}")
@@ -298,50 +257,36 @@ class ROIDSLParser:
     def _parse_goal(self, line: str):
         """Parse GOAL block"""
         # GOAL DelayCost: "Avoid $2M/mo burn"
-        pattern = r'GOAL\s+(\w+)\s*:\s*"([^"]+)"'
-        match = re.match(pattern, line)
-        
-        if not match:
-            raise SyntaxError(f"Invalid GOAL syntax: {line}")
-        
-        name = match.group(1)
-        value = match.group(2)
+        name, value = self._split_block(line, 'GOAL', _GOAL_RE)
         
         self.ast.goals.append(GoalNode(name=name, value=value))
+        self.ast.goals_by_name[name] = value
     
     def _parse_metric(self, line: str):
         """Parse METRIC block"""
         # METRIC VendorDrift: 0.45
-        pattern = r'METRIC\s+(\w+)\s*:\s*([\d.]+)'
-        match = re.match(pattern, line)
+        match = _METRIC_RE.match(line)
         
         if not match:
             raise SyntaxError(f"Invalid METRIC syntax: {line}")
         
-        name = match.group(1)
+        name = sys.intern(match.group(1))
         value = float(match.group(2))
         
         self.ast.metrics.append(MetricNode(name=name, value=value))
+        self.ast.metrics_by_name[name] = value
     
     def _parse_rmetric(self, line: str):
         """Parse RMetric block"""
         # RMetric StudyHealth: "TimelineRisk * 1.2 + VendorDrift"
-        pattern = r'RMetric\s+(\w+)\s*:\s*"([^"]+)"'
-        match = re.match(pattern, line)
-        
-        if not match:
-            raise SyntaxError(f"Invalid RMetric syntax: {line}")
-        
-        name = match.group(1)
-        expr = match.group(2)
+        name, expr = self._split_block(line, 'RMetric', _RMETRIC_RE)
         
         self.ast.rmetrics.append(RMetricNode(name=name, expr=expr))
     
     def _parse_trigger(self, line: str):
         """Parse WHEN/THEN trigger block"""
         # WHEN VendorDrift > 0.40 THEN escalate("vendor")
-        pattern = r'WHEN\s+(.+?)\s+THEN\s+(.+)'
-        match = re.match(pattern, line)
+        match = _TRIGGER_RE.match(line)
         
         if not match:
             raise SyntaxError(f"Invalid WHEN/THEN syntax: {line}")
@@ -354,14 +299,7 @@ class ROIDSLParser:
     def _parse_variant(self, line: str):
         """Parse VARIANT block"""
         # VARIANT Hero: "CRO Sponsor"
-        pattern = r'VARIANT\s+(\w+)\s*:\s*"([^"]+)"'
-        match = re.match(pattern, line)
-        
-        if not match:
-            raise SyntaxError(f"Invalid VARIANT syntax: {line}")
-        
-        variant_type = match.group(1)
-        value = match.group(2)
+        variant_type, value = self._split_block(line, 'VARIANT', _VARIANT_RE)
         
         # Allow any variant type for flexibility
         self.ast.variants.append(VariantNode(type=variant_type, value=value))
@@ -369,34 +307,66 @@ class ROIDSLParser:
     def _parse_output(self, line: str):
         """Parse OUTPUT block"""
         # OUTPUT MintSite
-        pattern = r'OUTPUT\s+(\w+)'
-        match = re.match(pattern, line)
+        match = _OUTPUT_RE.match(line)
         
         if not match:
             raise SyntaxError(f"Invalid OUTPUT syntax: {line}")
         
         output_type = match.group(1)
         
-        valid_outputs = ['SMS_CAMPAIGN', 'AGENT', 'RMetrics', 'vROI', 'MintSite', 'SK_SKILL']
-        if output_type not in valid_outputs:
-            raise SyntaxError(f"Invalid OUTPUT type '{output_type}'. Must be one of: {', '.join(valid_outputs)}")
+        if output_type not in _VALID_OUTPUTS:
+            raise SyntaxError(f"Invalid OUTPUT type '{output_type}'. Must be one of: {', '.join(_VALID_OUTPUTS)}")
         
         self.ast.output = output_type
     
     def get_metrics_map(self) -> Dict[str, float]:
-        """Get metrics as a dictionary"""
-        return {m.name: m.value for m in self.ast.metrics}
+        """Get metrics as a dictionary (a copy the caller may modify)"""
+        ast = self.ast
+        if not ast.metrics_by_name and ast.metrics:
+            # AST assembled without parse(); index it on first use
+            ast.metrics_by_name = {m.name: m.value for m in ast.metrics}
+        return dict(ast.metrics_by_name)
     
     def get_goals_map(self) -> Dict[str, str]:
-        """Get goals as a dictionary"""
-        return {g.name: g.value for g in self.ast.goals}
+        """Get goals as a dictionary (a copy the caller may modify)"""
+        ast = self.ast
+        if not ast.goals_by_name and ast.goals:
+            # AST assembled without parse(); index it on first use
+            ast.goals_by_name = {g.name: g.value for g in ast.goals}
+        return dict(ast.goals_by_name)
+
+
+# Block keyword -> parser method, built once at import
+_DISPATCH: Dict[str, Callable[[ROIDSLParser, str], None]] = {
+    'PERSONA': ROIDSLParser._parse_persona,
+    'GOAL': ROIDSLParser._parse_goal,
+    'METRIC': ROIDSLParser._parse_metric,
+    'RMetric': ROIDSLParser._parse_rmetric,
+    'WHEN': ROIDSLParser._parse_trigger,
+    'VARIANT': ROIDSLParser._parse_variant,
+    'CREDENTIAL': ROIDSLParser._parse_credential,
+    'CASE_STUDY': ROIDSLParser._parse_case_study,
+    'SERVICE': ROIDSLParser._parse_service,
+    'TRAINING': ROIDSLParser._parse_training,
+    'VROI_INPUT': ROIDSLParser._parse_vroi_input,
+    'VROI_OUTPUT': ROIDSLParser._parse_vroi_output,
+    'STAT': ROIDSLParser._parse_stat,
+    'MICROTRAINING': ROIDSLParser._parse_microtraining,
+    'SK_TAG': ROIDSLParser._parse_sk_tag,
+    'OUTPUT': ROIDSLParser._parse_output,
+}
+
+# Keyword prefixes for the open-ended SEO_<KEY> / CONTACT_<KEY> blocks
+_PREFIX_DISPATCH: Dict[str, Callable[[ROIDSLParser, str], None]] = {
+    'SEO': ROIDSLParser._parse_seo,
+    'CONTACT': ROIDSLParser._parse_contact,
+}
 
 
 # Convenience function
 def parse_roi_file(filepath: str) -> ROIDSLAST:
     """Parse a .roi file and return AST"""
-    with open(filepath, 'r') as f:
-        content = f.read()
-    
-    parser = ROIDSLParser(content)
-    return parser.parse()
+    # Stream lines straight from the file instead of reading it into one string
+    with open(filepath, 'r', encoding='utf-8') as f:
+        parser = ROIDSLParser(f)
+        return parser.parse()
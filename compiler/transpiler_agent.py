@@ -3,28 +3,70 @@ AI Agent Transpiler
 Generates AI agent configuration from ROI-DSL AST
 """
 
-import json
+import re
 from typing import Dict, Any, List
 
+from ._json import dumps
+
+
+# Keyword scans compiled once as single alternations
+_PAIN_AVOIDANCE_RE = re.compile(r'avoid|prevent', re.I)
+_WEIGHTED_METRIC_RE = re.compile(r'risk|drift', re.I)
+_ESCALATION_RE = re.compile(r'risk|drift|delay', re.I)
+_HIGH_PRIORITY_RE = re.compile(r'risk', re.I)
+
 
 class AgentTranspiler:
     """Transpiles ROI-DSL to AI Agent configuration"""
     
     def compile(self, ast) -> str:
         """Generate AI agent configuration JSON"""
+        return dumps(self.compile_dict(ast))
+    
+    def compile_dict(self, ast) -> Dict[str, Any]:
+        """Build the AI agent configuration"""
+        
+        # Single pass over metrics and triggers feeds every section that uses them
+        metrics_tracking = {}
+        questions = []
+        metric_escalations = []
+        for metric in ast.metrics:
+            metrics_tracking[metric.name] = metric.value
+            questions.append(self._build_question(metric))
+            if metric.value > 0.6:
+                metric_escalations.append({
+                    "condition": f"{metric.name} > 0.6",
+                    "reason": "metric_threshold_exceeded"
+                })
+        
+        automation_rules = []
+        trigger_escalations = []
+        for i, trigger in enumerate(ast.triggers):
+            automation_rules.append({
+                "trigger_id": f"trigger_{i+1}",
+                "condition": trigger.condition,
+                "action": trigger.action,
+                "priority": "high" if _HIGH_PRIORITY_RE.search(trigger.condition) else "medium"
+            })
+            # Check for high-value triggers
+            if _ESCALATION_RE.search(trigger.condition):
+                trigger_escalations.append({
+                    "condition": trigger.condition,
+                    "reason": "high_risk_detected"
+                })
         
         agent_config = {
             "agent_type": "roi_qualification_bot",
             "persona": self._build_persona(ast),
             "goals": self._extract_goals(ast),
-            "qualification_logic": self._build_qualification(ast),
+            "qualification_logic": self._build_qualification(questions),
             "conversation_flow": self._build_flow(ast),
-            "automation_rules": self._extract_triggers(ast),
-            "escalation_criteria": self._build_escalation(ast),
-            "metrics_tracking": {m.name: m.value for m in ast.metrics}
+            "automation_rules": automation_rules,
+            "escalation_criteria": self._build_escalation(trigger_escalations + metric_escalations),
+            "metrics_tracking": metrics_tracking
         }
         
-        return json.dumps(agent_config, indent=2)
+        return agent_config
     
     def _build_persona(self, ast) -> Dict[str, Any]:
         """Build agent persona"""
@@ -48,29 +90,28 @@ class AgentTranspiler:
             {
                 "goal_id": g.name,
                 "description": g.value,
-                "type": "pain_avoidance" if any(word in g.value.lower() for word in ['avoid', 'prevent']) else "value_gain"
+                "type": "pain_avoidance" if _PAIN_AVOIDANCE_RE.search(g.value) else "value_gain"
             }
             for g in ast.goals
         ]
     
-    def _build_qualification(self, ast) -> Dict[str, Any]:
-        """Build qualification questions based on metrics"""
-        questions = []
+    def _build_question(self, metric) -> Dict[str, Any]:
+        """Build a qualification question for a single metric"""
+        question = {
+            "metric": metric.name,
+            "question": f"On a scale of 0-100, how would you rate your current {metric.name}?",
+            "threshold": metric.value,
+            "weight": 1.0
+        }
         
-        for metric in ast.metrics:
-            question = {
-                "metric": metric.name,
-                "question": f"On a scale of 0-100, how would you rate your current {metric.name}?",
-                "threshold": metric.value,
-                "weight": 1.0
-            }
-            
-            # Higher weight for risk metrics
-            if 'risk' in metric.name.lower() or 'drift' in metric.name.lower():
-                question["weight"] = 1.5
-            
-            questions.append(question)
+        # Higher weight for risk metrics
+        if _WEIGHTED_METRIC_RE.search(metric.name):
+            question["weight"] = 1.5
         
+        return question
+    
+    def _build_qualification(self, questions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build qualification logic from per-metric questions"""
         return {
             "questions": questions,
             "scoring": {
@@ -82,76 +123,49 @@ class AgentTranspiler:
     
     def _build_flow(self, ast) -> List[Dict[str, Any]]:
         """Build conversation flow"""
-        flow = [
-            {
-                "step": 1,
-                "type": "greeting",
-                "message": "Hi! I help companies understand their ROI opportunities. Can I ask you a few quick questions?"
-            },
-            {
-                "step": 2,
-                "type": "pain_discovery",
-                "message": f"I noticed you're interested in {ast.goals[0].value if ast.goals else 'optimizing your operations'}. What's driving this need?"
-            },
-            {
-                "step": 3,
-                "type": "qualification",
-                "message": "Let me ask a few diagnostic questions to understand your situation better..."
-            }
-        ]
+        # Greeting, discovery and qualification steps, one step per metric, then the recommendation
+        n_metrics = len(ast.metrics)
+        flow = [None] * (4 + n_metrics)
+        
+        interest = ast.goals[0].value if ast.goals else 'optimizing your operations'
+        flow[0] = {
+            "step": 1,
+            "type": "greeting",
+            "message": "Hi! I help companies understand their ROI opportunities. Can I ask you a few quick questions?"
+        }
+        flow[1] = {
+            "step": 2,
+            "type": "pain_discovery",
+            "message": f"I noticed you're interested in {interest}. What's driving this need?"
+        }
+        flow[2] = {
+            "step": 3,
+            "type": "qualification",
+            "message": "Let me ask a few diagnostic questions to understand your situation better..."
+        }
         
         # Add metric-specific questions
-        for i, metric in enumerate(ast.metrics, start=4):
-            flow.append({
-                "step": i,
+        for i, metric in enumerate(ast.metrics, start=3):
+            flow[i] = {
+                "step": i + 1,
                 "type": "metric_question",
                 "metric": metric.name,
                 "message": f"How would you describe your current {metric.name}?"
-            })
+            }
         
         # Final step
-        flow.append({
-            "step": len(flow) + 1,
+        flow[-1] = {
+            "step": 4 + n_metrics,
             "type": "recommendation",
             "message": "Based on your answers, I can see some opportunities. Would you like to schedule a detailed ROI assessment?"
-        })
+        }
         
         return flow
     
-    def _extract_triggers(self, ast) -> List[Dict[str, Any]]:
-        """Extract automation triggers"""
-        return [
-            {
-                "trigger_id": f"trigger_{i+1}",
-                "condition": t.condition,
-                "action": t.action,
-                "priority": "high" if "risk" in t.condition.lower() else "medium"
-            }
-            for i, t in enumerate(ast.triggers)
-        ]
-    
-    def _build_escalation(self, ast) -> Dict[str, Any]:
-        """Build escalation rules"""
-        escalation = {
-            "immediate_escalation": [],
+    def _build_escalation(self, immediate: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Build escalation rules (trigger-based first, then metric-based)"""
+        return {
+            "immediate_escalation": immediate,
             "scheduled_followup": [],
             "nurture_sequence": []
         }
-        
-        # Check for high-value triggers
-        for trigger in ast.triggers:
-            if any(word in trigger.condition.lower() for word in ['risk', 'drift', 'delay']):
-                escalation["immediate_escalation"].append({
-                    "condition": trigger.condition,
-                    "reason": "high_risk_detected"
-                })
-        
-        # Add metric-based escalation
-        for metric in ast.metrics:
-            if metric.value > 0.6:
-                escalation["immediate_escalation"].append({
-                    "condition": f"{metric.name} > 0.6",
-                    "reason": "metric_threshold_exceeded"
-                })
-        
-        return escalation
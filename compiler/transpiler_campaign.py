@@ -3,29 +3,44 @@ SMS Campaign Transpiler
 Generates SMS campaign JSON from ROI-DSL AST
 """
 
-import json
 from typing import Dict, Any
 
+from ._json import dumps
+
 
 class SMSCampaignTranspiler:
     """Transpiles ROI-DSL to SMS campaign configuration"""
     
     def compile(self, ast) -> str:
         """Generate SMS campaign JSON"""
+        return dumps(self.compile_dict(ast))
+    
+    def compile_dict(self, ast) -> Dict[str, Any]:
+        """Build the SMS campaign configuration"""
+        
+        # One pass over metrics for both the KPI map and the risk message
+        metrics = {}
+        risk_metric = None
+        for m in ast.metrics:
+            metrics[m.name] = m.value
+            if risk_metric is None:
+                name = m.name.lower()
+                if 'risk' in name or 'drift' in name:
+                    risk_metric = m
         
         campaign = {
             "campaign_type": "value_first_sms",
             "persona": self._extract_persona(ast),
-            "messages": self._generate_messages(ast),
+            "messages": self._generate_messages(ast, risk_metric),
             "triggers": self._extract_triggers(ast),
-            "metrics": self._extract_metrics(ast),
+            "metrics": metrics,
             "metadata": {
                 "goals": [{"name": g.name, "value": g.value} for g in ast.goals],
                 "output_type": ast.output
             }
         }
         
-        return json.dumps(campaign, indent=2)
+        return campaign
     
     def _extract_persona(self, ast) -> Dict[str, str]:
         """Extract persona information"""
@@ -36,7 +51,7 @@ class SMSCampaignTranspiler:
             }
         return {"role": "Unknown", "description": ""}
     
-    def _generate_messages(self, ast) -> list:
+    def _generate_messages(self, ast, risk_metric) -> list:
         """Generate SMS message sequence"""
         messages = []
         
@@ -49,17 +64,15 @@ class SMSCampaignTranspiler:
                 "goal": primary_goal.name
             })
         
-        # Message 2: Risk/urgency if metrics present
-        if ast.metrics:
-            risk_metrics = [m for m in ast.metrics if 'risk' in m.name.lower() or 'drift' in m.name.lower()]
-            if risk_metrics:
-                metric = risk_metrics[0]
-                messages.append({
-                    "sequence": 2,
-                    "template": f"Your {metric.name} is at {int(metric.value * 100)}%. Most companies see issues at 40%+. Reply SCAN for free assessment.",
-                    "trigger_metric": metric.name,
-                    "trigger_threshold": 0.4
-                })
+        # Message 2: Risk/urgency if a risk metric is present
+        if risk_metric:
+            pct = int(risk_metric.value * 100)
+            messages.append({
+                "sequence": 2,
+                "template": f"Your {risk_metric.name} is at {pct}%. Most companies see issues at 40%+. Reply SCAN for free assessment.",
+                "trigger_metric": risk_metric.name,
+                "trigger_threshold": 0.4
+            })
         
         # Message 3: CTA
         cta_variant = next((v.value for v in ast.variants if v.type == "CTA"), "Get Started")
@@ -73,17 +86,11 @@ class SMSCampaignTranspiler:
     
     def _extract_triggers(self, ast) -> list:
         """Extract automation triggers"""
-        triggers = []
-        
-        for trigger in ast.triggers:
-            triggers.append({
+        return [
+            {
                 "condition": trigger.condition,
                 "action": trigger.action,
                 "type": "metric_threshold"
-            })
-        
-        return triggers
-    
-    def _extract_metrics(self, ast) -> Dict[str, float]:
-        """Extract metrics as tracking KPIs"""
-        return {m.name: m.value for m in ast.metrics}
+            }
+            for trigger in ast.triggers
+        ]
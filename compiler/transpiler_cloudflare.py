@@ -4,192 +4,65 @@ Generates static HTML/React sites deployable to Cloudflare Pages
 """
 
 import json
-from typing import Dict, Any
+import re
+from typing import Dict, Any, Iterator, Union
 
+from .transpiler_mintsite import MintSiteTranspiler
 
-class CloudflarePagesTranspiler:
-    """Transpiles ROI-DSL to Cloudflare Pages static site"""
-    
-    def compile(self, ast) -> Dict[str, str]:
-        """
-        Generate complete static site files
-        Returns dict of {filename: content}
-        """
-        
-        files = {}
-        
-        # 1. Generate index.html
-        files['index.html'] = self._generate_html(ast)
-        
-        # 2. Generate _headers (Cloudflare config)
-        files['_headers'] = self._generate_headers()
-        
-        # 3. Generate _redirects
-        files['_redirects'] = self._generate_redirects()
-        
-        # 4. Generate site config JSON
-        files['config.json'] = self._generate_config(ast)
-        
-        # 5. Generate functions/api.js (Worker)
-        files['functions/api.js'] = self._generate_worker_api(ast)
-        
-        return files
-    
-    def _generate_html(self, ast) -> str:
-        """Generate complete HTML page"""
-        
-        # Extract data
-        persona = ast.persona.value if ast.persona else "Expert"
-        hero_headline = next((v.value for v in ast.variants if v.type == "Hero"), "Transform Your Business")
-        hero_subhead = next((v.value for v in ast.variants if v.type == "Subhead"), ast.goals[0].value if ast.goals else "")
-        cta_primary = next((v.value for v in ast.variants if v.type == "CTA"), "Get Started")
-        cta_secondary = next((v.value for v in ast.variants if v.type == "SecondaryCTA"), "Learn More")
-        
-        # Build HTML
-        html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-  <meta charset="UTF-8"/>
-  <meta name="viewport" content="width=device-width, initial-scale=1.0"/>
-  <title>{ast.seo.get('TITLE', f'{persona} - Professional Services')}</title>
-  <meta name="description" content="{ast.seo.get('DESCRIPTION', '')}"/>
-  <meta name="keywords" content="{ast.seo.get('KEYWORDS', '')}"/>
-  
-  <!-- Cloudflare Web Analytics -->
-  <script defer src='https://static.cloudflareinsights.com/beacon.min.js' data-cf-beacon='{{"token": "YOUR_TOKEN"}}'></script>
-  
-  <script src="https://cdn.tailwindcss.com"></script>
-  <script>
-    // Load site config
-    let siteConfig = null;
-    fetch('/config.json')
-      .then(r => r.json())
-      .then(config => {{
-        siteConfig = config;
-        console.log('Site config loaded:', config);
-      }});
-  </script>
-</head>
+# "$2M"-style monthly burn figures in goal text
+_MONEY_RE = re.compile(r'\$(\d+\.?\d*)M')
 
-<body class="bg-white text-gray-900">
+# Quantified goal text: any dollar amount or percentage
+_QUANT_RE = re.compile(r'[$%]')
 
-<!-- HERO -->
-<section id="hero" class="pt-20 pb-24 px-6 md:px-16 lg:px-32 bg-gradient-to-br from-blue-50 to-white">
-  <div class="max-w-4xl mx-auto text-center">
-    <h1 class="text-4xl md:text-6xl font-extrabold leading-tight">
-      {hero_headline}
-    </h1>
-    
-    <p class="mt-6 text-lg md:text-xl text-gray-700 leading-relaxed">
-      {hero_subhead}
-    </p>
-    
-    <div class="mt-8 flex flex-col md:flex-row gap-4 justify-center">
-      <a href="#vroi-calculator"
-         class="inline-block bg-blue-700 text-white px-8 py-4 rounded-md text-lg font-semibold hover:bg-blue-800 transition">
-        {cta_primary} →
-      </a>
-      <a href="#services"
-         class="inline-block bg-white text-blue-700 border-2 border-blue-700 px-8 py-4 rounded-md text-lg font-semibold hover:bg-blue-50 transition">
-        {cta_secondary}
-      </a>
-    </div>
-"""
+# Uppercase letters, for splitting camelCase names into words
+_CAMEL_RE = re.compile(r'([A-Z])')
 
-        # Add credentials/stats
-        if ast.credentials:
-            html += f"""
-    <div class="mt-12 grid grid-cols-2 md:grid-cols-{min(len(ast.credentials), 4)} gap-6 text-center">
-"""
-            for key, value in ast.credentials.items():
-                html += f"""      <div class="text-gray-700">
-        <div class="text-2xl font-bold text-blue-700">{value.split()[0]}</div>
-        <div class="text-sm mt-1">{' '.join(value.split()[1:])}</div>
-      </div>
-"""
-            html += "    </div>\n"
-        
-        html += """  </div>
-</section>
+# Keyword -> icon, in priority order (first matching keyword wins)
+_ICON_KEYWORDS = {
+    'cost': "💰", 'save': "💰", 'burn': "💰", 'prevent': "💰",
+    'time': "⏱️", 'timeline': "⏱️", 'delay': "⏱️", 'week': "⏱️",
+    'risk': "⚠️", 'exposure': "⚠️", 'submission': "⚠️",
+    'vendor': "🤝", 'cro': "🤝", 'alignment': "🤝",
+    'deviation': "📊", 'reduce': "📊", 'quality': "📊",
+    'control': "🛡️", 'governance': "🛡️", 'oversight': "🛡️",
+}
 
-"""
+# Static page fragments, built once at import rather than per compile
 
-        # Stats Bar
-        if ast.stats:
-            html += """<!-- STATS BAR -->
+_STATS_OPEN_HTML = """<!-- STATS BAR -->
 <section id="stats" class="py-10 bg-gray-50 px-6 md:px-16 lg:px-32">
   <div class="max-w-5xl mx-auto grid grid-cols-2 md:grid-cols-6 gap-6 text-center text-gray-700">
 """
-            for key, value in ast.stats.items():
-                html += f"""    <div>
-      <strong class="text-xl text-blue-700">{value.split()[0]}</strong><br>
-      <span class="text-sm">{' '.join(value.split()[1:])}</span>
-    </div>
-"""
-            html += """  </div>
+
+_STATS_CLOSE_HTML = """  </div>
 </section>
 
 """
 
-        # Value Propositions
-        if ast.goals:
-            html += """<!-- VALUE PROPOSITIONS -->
+_SERVICES_OPEN_HTML = """<!-- VALUE PROPOSITIONS -->
 <section id="services" class="py-20 px-6 md:px-16 lg:px-32">
   <div class="max-w-5xl mx-auto">
     <h2 class="text-3xl md:text-4xl font-bold text-center mb-12">How We Help</h2>
     
     <div class="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-8">
 """
-            for goal in ast.goals:
-                # Extract dollar amounts for highlighting
-                has_value = '$' in goal.value or '%' in goal.value
-                icon = self._infer_icon(goal.value)
-                
-                html += f"""      <div class="bg-white border border-gray-200 rounded-lg p-6 hover:shadow-lg transition">
-        <div class="text-4xl mb-4">{icon}</div>
-        <h3 class="text-xl font-semibold mb-3">{self._format_title(goal.name)}</h3>
-        <p class="text-gray-700">{goal.value}</p>
-        {'<p class="mt-3 text-blue-700 font-semibold">Quantified Value</p>' if has_value else ''}
-      </div>
-"""
-            
-            html += """    </div>
-  </div>
-</section>
 
-"""
-
-        # Case Studies
-        if ast.case_studies:
-            html += """<!-- CASE STUDIES -->
+_CASE_STUDIES_OPEN_HTML = """<!-- CASE STUDIES -->
 <section id="case-studies" class="py-20 bg-gray-50 px-6 md:px-16 lg:px-32">
   <div class="max-w-5xl mx-auto">
     <h2 class="text-3xl md:text-4xl font-bold text-center mb-12">Success Stories</h2>
     
     <div class="grid grid-cols-1 md:grid-cols-2 gap-8">
 """
-            for key, description in ast.case_studies.items():
-                # Parse case study format
-                parts = description.split('.')
-                title = parts[0] if parts else description
-                details = '. '.join(parts[1:]) if len(parts) > 1 else ""
-                
-                html += f"""      <div class="bg-white border border-gray-200 rounded-lg p-6 hover:shadow-lg transition">
-        <h3 class="text-lg font-semibold mb-3 text-blue-700">{self._format_title(key)}</h3>
-        <p class="text-gray-700 mb-3">{title}</p>
-        {f'<p class="text-sm text-gray-600">{details}</p>' if details else ''}
-      </div>
-"""
-            
-            html += """    </div>
+
+_GRID_CLOSE_HTML = """    </div>
   </div>
 </section>
 
 """
 
-        # vROI Calculator
-        if ast.vroi_inputs:
-            html += """<!-- vROI CALCULATOR -->
+_VROI_OPEN_HTML = """<!-- vROI CALCULATOR -->
 <section id="vroi-calculator" class="py-20 px-6 md:px-16 lg:px-32">
   <div class="max-w-4xl mx-auto">
     <h2 class="text-3xl md:text-4xl font-bold text-center mb-4">Calculate Your ROI</h2>
@@ -198,20 +71,8 @@ class CloudflarePagesTranspiler:
     <form id="vroi-form" class="bg-white border border-gray-200 rounded-lg p-8 shadow-sm">
       <div class="grid grid-cols-1 md:grid-cols-2 gap-6">
 """
-            
-            for key, label in ast.vroi_inputs.items():
-                html += f"""        <div>
-          <label class="block text-sm font-semibold mb-2 text-gray-700">{label}</label>
-          <input 
-            type="text" 
-            name="{key}"
-            class="w-full border border-gray-300 rounded-md px-4 py-3 focus:ring-2 focus:ring-blue-500 focus:border-transparent"
-            placeholder="{label}"
-          />
-        </div>
-"""
-            
-            html += """      </div>
+
+_VROI_CLOSE_HTML = """      </div>
       
       <button 
         type="submit"
@@ -267,37 +128,9 @@ document.getElementById('vroi-form').addEventListener('submit', async (e) => {
 
 """
 
-        # Contact CTA
-        contact_email = ast.contact.get('EMAIL', 'contact@example.com')
-        contact_name = ast.contact.get('NAME', 'Contact Us')
-        
-        html += f"""<!-- CONTACT CTA -->
-<section id="contact" class="py-20 bg-gradient-to-br from-blue-700 to-blue-900 text-white px-6 md:px-16 lg:px-32">
-  <div class="max-w-4xl mx-auto text-center">
-    <h2 class="text-3xl md:text-4xl font-bold mb-6">Ready to Get Started?</h2>
-    <p class="text-xl mb-8 text-blue-100">Let's discuss how we can help you achieve your goals.</p>
-    
-    <a href="mailto:{contact_email}" 
-       class="inline-block bg-white text-blue-700 px-8 py-4 rounded-md text-lg font-semibold hover:bg-blue-50 transition">
-      Contact {contact_name} →
-    </a>
-  </div>
-</section>
 
-<!-- FOOTER -->
-<footer class="py-8 bg-gray-900 text-gray-400 text-center">
-  <p>&copy; 2025 {contact_name}. All rights reserved.</p>
-  <p class="mt-2 text-sm">Powered by HyperAI Marketing • Built with ROI-DSL</p>
-</footer>
-
-</body>
-</html>"""
-        
-        return html
-    
-    def _generate_headers(self) -> str:
-        """Generate Cloudflare Pages _headers file"""
-        return """/*
+# Cloudflare Pages _headers and _redirects files; neither depends on the AST
+_HEADERS_TXT = """/*
   X-Frame-Options: SAMEORIGIN
   X-Content-Type-Options: nosniff
   X-XSS-Protection: 1; mode=block
@@ -311,119 +144,69 @@ document.getElementById('vroi-form').addEventListener('submit', async (e) => {
 /functions/*
   Cache-Control: no-cache
 """
-    
-    def _generate_redirects(self) -> str:
-        """Generate Cloudflare Pages _redirects file"""
-        return """# Redirect rules
+
+_REDIRECTS_TXT = """# Redirect rules
 /home /
 /contact /#contact
 /services /#services
 /roi /#vroi-calculator
 """
-    
-    def _generate_config(self, ast) -> str:
-        """Generate site configuration JSON"""
-        from compiler.transpiler_mintsite import MintSiteTranspiler
-        transpiler = MintSiteTranspiler()
-        return transpiler.compile(ast)
-    
-    def _generate_worker_api(self, ast) -> str:
-        """Generate Cloudflare Worker for API endpoints"""
-        
-        # Build vROI calculation logic
-        vroi_logic = self._generate_vroi_logic(ast)
-        
-        worker = f"""// Cloudflare Worker API
+
+# Worker API source; only the monthly burn default (spliced between the two
+# halves) depends on the AST
+_WORKER_HEAD_JS = """// Cloudflare Worker API
 // Handles vROI calculations and form submissions
 
-export async function onRequestPost(context) {{
-  const {{ request, env }} = context;
+export async function onRequestPost(context) {
+  const { request, env } = context;
   const url = new URL(request.url);
   
   // Route to appropriate handler
-  if (url.pathname === '/api/calculate-vroi') {{
+  if (url.pathname === '/api/calculate-vroi') {
     return handleVROI(request, env);
-  }}
+  }
   
-  if (url.pathname === '/api/contact') {{
+  if (url.pathname === '/api/contact') {
     return handleContact(request, env);
-  }}
+  }
   
-  return new Response('Not Found', {{ status: 404 }});
-}}
+  return new Response('Not Found', { status: 404 });
+}
 
-async function handleVROI(request, env) {{
-  try {{
+async function handleVROI(request, env) {
+  try {
     const data = await request.json();
     
     // Calculate vROI
     const result = calculateVROI(data);
     
     // Log to analytics (optional)
-    // await env.ANALYTICS.writeDataPoint({{
+    // await env.ANALYTICS.writeDataPoint({
     //   blobs: ['vroi_calculation'],
     //   doubles: [result.delayCost],
     //   indexes: [data.StudyPhase]
-    // }});
+    // });
     
-    return new Response(JSON.stringify(result), {{
-      headers: {{
+    return new Response(JSON.stringify(result), {
+      headers: {
         'Content-Type': 'application/json',
         'Access-Control-Allow-Origin': '*'
-      }}
-    }});
-  }} catch (error) {{
-    return new Response(JSON.stringify({{ error: error.message }}), {{
+      }
+    });
+  } catch (error) {
+    return new Response(JSON.stringify({ error: error.message }), {
       status: 400,
-      headers: {{ 'Content-Type': 'application/json' }}
-    }});
-  }}
-}}
-
-function calculateVROI(data) {{
-  {vroi_logic}
-}}
+      headers: { 'Content-Type': 'application/json' }
+    });
+  }
+}
 
-async function handleContact(request, env) {{
-  try {{
-    const data = await request.json();
-    
-    // Send to email service or CRM
-    // await fetch('https://api.sendgrid.com/v3/mail/send', {{ ... }});
-    
-    // Or store in KV
-    // await env.LEADS.put(`lead_${{Date.now()}}`, JSON.stringify(data));
-    
-    return new Response(JSON.stringify({{ success: true }}), {{
-      headers: {{ 'Content-Type': 'application/json' }}
-    }});
-  }} catch (error) {{
-    return new Response(JSON.stringify({{ error: error.message }}), {{
-      status: 400,
-      headers: {{ 'Content-Type': 'application/json' }}
-    }});
-  }}
-}}
-"""
-        return worker
-    
-    def _generate_vroi_logic(self, ast) -> str:
-        """Generate vROI calculation JavaScript"""
-        
-        # Extract dollar values from goals
-        monthly_burn = 2000000  # Default $2M
-        for goal in ast.goals:
-            if '$' in goal.value and 'M' in goal.value:
-                # Extract value like "$2M"
-                import re
-                match = re.search(r'\$(\d+\.?\d*)M', goal.value)
-                if match:
-                    monthly_burn = float(match.group(1)) * 1000000
-                    break
-        
-        return f"""
+function calculateVROI(data) {
+  
   // Extract inputs
-  const monthlyBurn = parseFloat(data.MonthlyBurn) || {monthly_burn};
+  const monthlyBurn = parseFloat(data.MonthlyBurn) || """
+
+_WORKER_TAIL_JS = """;
   const delayWeeks = parseFloat(data.ActualDelay) || 0;
   const reworkPercent = parseFloat(data.CRORework) || 0;
   
@@ -438,43 +221,320 @@ async function handleContact(request, env) {{
   const totalImpact = delayCost + reworkCost;
   
   // Format currency
-  const formatter = new Intl.NumberFormat('en-US', {{
+  const formatter = new Intl.NumberFormat('en-US', {
     style: 'currency',
     currency: 'USD',
     minimumFractionDigits: 0,
     maximumFractionDigits: 0
-  }});
+  });
   
-  return {{
+  return {
     'Monthly Burn Rate': formatter.format(monthlyBurn),
     'Cost of Delay': formatter.format(delayCost),
     'Rework Cost Impact': formatter.format(reworkCost),
     'Total Financial Exposure': formatter.format(totalImpact),
     'Recommended Action': totalImpact > 1000000 ? 'Immediate Intervention Required' : 'Schedule Assessment'
-  }};
+  };
+
+}
+
+async function handleContact(request, env) {
+  try {
+    const data = await request.json();
+    
+    // Send to email service or CRM
+    // await fetch('https://api.sendgrid.com/v3/mail/send', { ... });
+    
+    // Or store in KV
+    // await env.LEADS.put(`lead_${Date.now()}`, JSON.stringify(data));
+    
+    return new Response(JSON.stringify({ success: true }), {
+      headers: { 'Content-Type': 'application/json' }
+    });
+  } catch (error) {
+    return new Response(JSON.stringify({ error: error.message }), {
+      status: 400,
+      headers: { 'Content-Type': 'application/json' }
+    });
+  }
+}
 """
+
+
+class CloudflarePagesTranspiler:
+    """Transpiles ROI-DSL to Cloudflare Pages static site"""
+    
+    def __init__(self) -> None:
+        # Embedded site config, cached like the MintSite target's own output
+        self._mint = MintSiteTranspiler()
+    
+    def compile(self, ast) -> Dict[str, str]:
+        """
+        Generate complete static site files
+        Returns dict of {filename: content}
+        """
+        
+        return {
+            # Static page
+            'index.html': self._generate_html(ast),
+            **self.compile_assets(ast),
+        }
+    
+    def compile_assets(self, ast) -> Dict[str, str]:
+        """
+        Generate every site file except index.html
+        Lets callers stream the page itself via write_html()
+        """
+        return {
+            # Cloudflare Pages config
+            '_headers': _HEADERS_TXT,
+            '_redirects': _REDIRECTS_TXT,
+            # Site config JSON
+            'config.json': self._generate_config(ast),
+            # Worker API
+            'functions/api.js': self._generate_worker_api(ast),
+        }
+    
+    def _generate_html(self, ast) -> str:
+        """Generate complete HTML page"""
+        return "".join(self._iter_html(ast))
+    
+    def write_html(self, ast, fp) -> None:
+        """Stream the HTML page to an open text file without building it in memory"""
+        fp.writelines(self._iter_html(ast))
+    
+    def _iter_html(self, ast) -> Iterator[str]:
+        """Yield the HTML page fragment by fragment"""
+        yield from self._render_hero(ast)
+        yield from self._render_stats(ast)
+        yield from self._render_services(ast)
+        yield from self._render_case_studies(ast)
+        yield from self._render_vroi_calculator(ast)
+        yield from self._render_contact(ast)
+    
+    def _variant_map(self, ast) -> Dict[str, str]:
+        """Map variant type to value, first occurrence wins"""
+        return {v.type: v.value for v in reversed(ast.variants)}
+    
+    def _render_hero(self, ast) -> Iterator[str]:
+        """Page head, hero section and credentials"""
+        
+        # Extract data
+        persona = ast.persona.value if ast.persona else "Expert"
+        vm = self._variant_map(ast)
+        hero_headline = vm.get("Hero", "Transform Your Business")
+        if "Subhead" in vm:
+            hero_subhead = vm["Subhead"]
+        else:
+            hero_subhead = ast.goals[0].value if ast.goals else ""
+        cta_primary = vm.get("CTA", "Get Started")
+        cta_secondary = vm.get("SecondaryCTA", "Learn More")
+        # Only format the fallback title when SEO doesn't supply one
+        title = ast.seo['TITLE'] if 'TITLE' in ast.seo else f'{persona} - Professional Services'
+        
+        yield f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8"/>
+  <meta name="viewport" content="width=device-width, initial-scale=1.0"/>
+  <title>{title}</title>
+  <meta name="description" content="{ast.seo.get('DESCRIPTION', '')}"/>
+  <meta name="keywords" content="{ast.seo.get('KEYWORDS', '')}"/>
+  
+  <!-- Cloudflare Web Analytics -->
+  <script defer src='https://static.cloudflareinsights.com/beacon.min.js' data-cf-beacon='{{"token": "YOUR_TOKEN"}}'></script>
+  
+  <script src="https://cdn.tailwindcss.com"></script>
+  <script>
+    // Load site config
+    let siteConfig = null;
+    fetch('/config.json')
+      .then(r => r.json())
+      .then(config => {{
+        siteConfig = config;
+        console.log('Site config loaded:', config);
+      }});
+  </script>
+</head>
+
+<body class="bg-white text-gray-900">
+
+<!-- HERO -->
+<section id="hero" class="pt-20 pb-24 px-6 md:px-16 lg:px-32 bg-gradient-to-br from-blue-50 to-white">
+  <div class="max-w-4xl mx-auto text-center">
+    <h1 class="text-4xl md:text-6xl font-extrabold leading-tight">
+      {hero_headline}
+    </h1>
+    
+    <p class="mt-6 text-lg md:text-xl text-gray-700 leading-relaxed">
+      {hero_subhead}
+    </p>
+    
+    <div class="mt-8 flex flex-col md:flex-row gap-4 justify-center">
+      <a href="#vroi-calculator"
+         class="inline-block bg-blue-700 text-white px-8 py-4 rounded-md text-lg font-semibold hover:bg-blue-800 transition">
+        {cta_primary} →
+      </a>
+      <a href="#services"
+         class="inline-block bg-white text-blue-700 border-2 border-blue-700 px-8 py-4 rounded-md text-lg font-semibold hover:bg-blue-50 transition">
+        {cta_secondary}
+      </a>
+    </div>
+"""
+
+        # Add credentials/stats
+        if ast.credentials:
+            yield f"""
+    <div class="mt-12 grid grid-cols-2 md:grid-cols-{min(len(ast.credentials), 4)} gap-6 text-center">
+"""
+            for key, value in ast.credentials.items():
+                tokens = value.split()
+                yield f"""      <div class="text-gray-700">
+        <div class="text-2xl font-bold text-blue-700">{tokens[0]}</div>
+        <div class="text-sm mt-1">{' '.join(tokens[1:])}</div>
+      </div>
+"""
+            yield "    </div>\n"
+        
+        yield """  </div>
+</section>
+
+"""
+    
+    def _render_stats(self, ast) -> Iterator[str]:
+        """Stats bar"""
+        
+        if ast.stats:
+            yield _STATS_OPEN_HTML
+            for key, value in ast.stats.items():
+                tokens = value.split()
+                yield f"""    <div>
+      <strong class="text-xl text-blue-700">{tokens[0]}</strong><br>
+      <span class="text-sm">{' '.join(tokens[1:])}</span>
+    </div>
+"""
+            yield _STATS_CLOSE_HTML
+    
+    def _render_services(self, ast) -> Iterator[str]:
+        """Value proposition cards"""
+        
+        if ast.goals:
+            fmt = self._format_title
+            infer_icon = self._infer_icon
+            yield _SERVICES_OPEN_HTML
+            for goal in ast.goals:
+                # Extract dollar amounts for highlighting
+                has_value = _QUANT_RE.search(goal.value) is not None
+                icon = infer_icon(goal.value)
+                
+                yield f"""      <div class="bg-white border border-gray-200 rounded-lg p-6 hover:shadow-lg transition">
+        <div class="text-4xl mb-4">{icon}</div>
+        <h3 class="text-xl font-semibold mb-3">{fmt(goal.name)}</h3>
+        <p class="text-gray-700">{goal.value}</p>
+        {'<p class="mt-3 text-blue-700 font-semibold">Quantified Value</p>' if has_value else ''}
+      </div>
+"""
+            
+            yield _GRID_CLOSE_HTML
+    
+    def _render_case_studies(self, ast) -> Iterator[str]:
+        """Case study cards"""
+        
+        if ast.case_studies:
+            fmt = self._format_title
+            yield _CASE_STUDIES_OPEN_HTML
+            for key, description in ast.case_studies.items():
+                # Parse case study format
+                sentences = description.split('.')
+                title = sentences[0]
+                details = '. '.join(sentences[1:]) if len(sentences) > 1 else ""
+                
+                yield f"""      <div class="bg-white border border-gray-200 rounded-lg p-6 hover:shadow-lg transition">
+        <h3 class="text-lg font-semibold mb-3 text-blue-700">{fmt(key)}</h3>
+        <p class="text-gray-700 mb-3">{title}</p>
+        {f'<p class="text-sm text-gray-600">{details}</p>' if details else ''}
+      </div>
+"""
+            
+            yield _GRID_CLOSE_HTML
+    
+    def _render_vroi_calculator(self, ast) -> Iterator[str]:
+        """vROI calculator form and its submit handler"""
+        
+        if ast.vroi_inputs:
+            yield _VROI_OPEN_HTML
+            
+            for key, label in ast.vroi_inputs.items():
+                yield f"""        <div>
+          <label class="block text-sm font-semibold mb-2 text-gray-700">{label}</label>
+          <input 
+            type="text" 
+            name="{key}"
+            class="w-full border border-gray-300 rounded-md px-4 py-3 focus:ring-2 focus:ring-blue-500 focus:border-transparent"
+            placeholder="{label}"
+          />
+        </div>
+"""
+            
+            yield _VROI_CLOSE_HTML
+    
+    def _render_contact(self, ast) -> Iterator[str]:
+        """Contact CTA and footer"""
+        
+        # Contact CTA
+        contact_email = ast.contact.get('EMAIL', 'contact@example.com')
+        contact_name = ast.contact.get('NAME', 'Contact Us')
+        
+        yield f"""<!-- CONTACT CTA -->
+<section id="contact" class="py-20 bg-gradient-to-br from-blue-700 to-blue-900 text-white px-6 md:px-16 lg:px-32">
+  <div class="max-w-4xl mx-auto text-center">
+    <h2 class="text-3xl md:text-4xl font-bold mb-6">Ready to Get Started?</h2>
+    <p class="text-xl mb-8 text-blue-100">Let's discuss how we can help you achieve your goals.</p>
+    
+    <a href="mailto:{contact_email}" 
+       class="inline-block bg-white text-blue-700 px-8 py-4 rounded-md text-lg font-semibold hover:bg-blue-50 transition">
+      Contact {contact_name} →
+    </a>
+  </div>
+</section>
+
+<!-- FOOTER -->
+<footer class="py-8 bg-gray-900 text-gray-400 text-center">
+  <p>&copy; 2025 {contact_name}. All rights reserved.</p>
+  <p class="mt-2 text-sm">Powered by HyperAI Marketing • Built with ROI-DSL</p>
+</footer>
+
+</body>
+</html>"""
+    
+    def _generate_config(self, ast) -> str:
+        """Generate site configuration JSON"""
+        return self._mint.compile(ast)
+    
+    def _generate_worker_api(self, ast) -> str:
+        """Generate Cloudflare Worker for API endpoints"""
+        return f"{_WORKER_HEAD_JS}{self._extract_monthly_burn(ast)}{_WORKER_TAIL_JS}"
+    
+    def _extract_monthly_burn(self, ast) -> Union[int, float]:
+        """Monthly burn for the vROI logic, from the first "$XM" goal"""
+        for goal in ast.goals:
+            if '$' in goal.value and 'M' in goal.value:
+                # Extract value like "$2M"
+                match = _MONEY_RE.search(goal.value)
+                if match:
+                    return float(match.group(1)) * 1000000
+        return 2000000  # Default $2M
     
     def _infer_icon(self, text: str) -> str:
         """Infer emoji icon from text"""
         text_lower = text.lower()
         
-        if any(word in text_lower for word in ['cost', 'save', 'burn', 'prevent']):
-            return "💰"
-        elif any(word in text_lower for word in ['time', 'timeline', 'delay', 'week']):
-            return "⏱️"
-        elif any(word in text_lower for word in ['risk', 'exposure', 'submission']):
-            return "⚠️"
-        elif any(word in text_lower for word in ['vendor', 'cro', 'alignment']):
-            return "🤝"
-        elif any(word in text_lower for word in ['deviation', 'reduce', 'quality']):
-            return "📊"
-        elif any(word in text_lower for word in ['control', 'governance', 'oversight']):
-            return "🛡️"
-        else:
-            return "✓"
+        for word, icon in _ICON_KEYWORDS.items():
+            if word in text_lower:
+                return icon
+        return "✓"
     
     def _format_title(self, name: str) -> str:
         """Format camelCase to Title Case"""
-        import re
-        spaced = re.sub(r'([A-Z])', r' \1', name)
+        spaced = _CAMEL_RE.sub(r' \1', name)
         return spaced.strip()
@@ -3,16 +3,49 @@ MintSite Transpiler
 Generates MintSite JSON configuration from ROI-DSL AST
 """
 
-import json
+import re
 from typing import Dict, Any, List
 
+from ._cache import OutputCache
+from ._json import dumps
+
+# Quantified goal text: any dollar amount or percentage
+_QUANT_RE = re.compile(r'[$%]')
+
+# Keyword -> category tables, in priority order (first matching keyword wins)
+_VERTICAL_KEYWORDS = {
+    'clinical': "clinical_research", 'trial': "clinical_research",
+    'cro': "clinical_research", 'pharma': "clinical_research",
+    'saas': "technology", 'software': "technology", 'tech': "technology",
+    'manufacturing': "manufacturing", 'supply': "manufacturing",
+    'operations': "manufacturing",
+    'finance': "financial", 'banking': "financial", 'investment': "financial",
+}
+
+_ICON_KEYWORDS = {
+    'cost': "dollar-sign", 'save': "dollar-sign", 'burn': "dollar-sign",
+    'time': "clock", 'timeline': "clock", 'delay': "clock",
+    'control': "shield-check", 'oversight': "shield-check",
+    'manage': "shield-check",
+    'risk': "alert-triangle", 'compliance': "alert-triangle",
+}
+
 
 class MintSiteTranspiler:
     """Transpiles ROI-DSL to MintSite configuration"""
     
+    def __init__(self) -> None:
+        self._cache = OutputCache(('persona', 'goals', 'metrics', 'rmetrics', 'triggers', 'variants'))
+    
     def compile(self, ast) -> str:
         """Generate MintSite JSON configuration"""
+        # Re-transpiling an identical definition returns the cached output
+        return self._cache.get(ast, self._compile)
+    
+    def _compile(self, ast) -> str:
+        """Build and serialize the site config"""
         
+        vm = self._variant_map(ast)
         site_config = {
             "site_version": "2.1",
             "persona": self._extract_persona(ast),
@@ -32,14 +65,14 @@ class MintSiteTranspiler:
                 ]
             },
             "page_variants": self._extract_variants(ast),
-            "hero_section": self._build_hero(ast),
+            "hero_section": self._build_hero(ast, vm),
             "value_props": self._build_value_props(ast),
             "case_studies": self._build_case_studies(ast),
-            "cta": self._build_cta(ast),
+            "cta": self._build_cta(ast, vm),
             "seo": self._build_seo(ast)
         }
         
-        return json.dumps(site_config, indent=2)
+        return dumps(site_config)
     
     def _extract_persona(self, ast) -> Dict[str, str]:
         """Extract persona information"""
@@ -53,25 +86,21 @@ class MintSiteTranspiler:
     
     def _extract_variants(self, ast) -> Dict[str, Any]:
         """Extract page variants"""
-        variants = {
-            "hero": None,
-            "resume": None,
-            "cta": None
+        # Later definitions override earlier ones here
+        latest = {v.type: v.value for v in ast.variants}
+        return {
+            "hero": latest.get("Hero"),
+            "resume": latest.get("Resume"),
+            "cta": latest.get("CTA")
         }
-        
-        for variant in ast.variants:
-            if variant.type == "Hero":
-                variants["hero"] = variant.value
-            elif variant.type == "Resume":
-                variants["resume"] = variant.value
-            elif variant.type == "CTA":
-                variants["cta"] = variant.value
-        
-        return variants
     
-    def _build_hero(self, ast) -> Dict[str, Any]:
+    def _variant_map(self, ast) -> Dict[str, str]:
+        """Map variant type to value, first occurrence wins"""
+        return {v.type: v.value for v in reversed(ast.variants)}
+    
+    def _build_hero(self, ast, vm: Dict[str, str]) -> Dict[str, Any]:
         """Build hero section"""
-        hero_variant = next((v.value for v in ast.variants if v.type == "Hero"), None)
+        hero_variant = vm.get("Hero")
         
         primary_goal = ast.goals[0] if ast.goals else None
         
@@ -79,19 +108,21 @@ class MintSiteTranspiler:
             "headline": hero_variant or (ast.persona.value if ast.persona else "Transform Your Business"),
             "subheadline": primary_goal.value if primary_goal else "Achieve measurable results",
             "background_theme": "professional",
-            "cta_primary": next((v.value for v in ast.variants if v.type == "CTA"), "Get Started")
+            "cta_primary": vm.get("CTA", "Get Started")
         }
     
     def _build_value_props(self, ast) -> List[Dict[str, Any]]:
         """Build value proposition blocks"""
-        props = []
+        props: List[Dict[str, Any]] = []
+        append = props.append
+        infer_icon = self._infer_icon
         
         for goal in ast.goals:
-            props.append({
+            append({
                 "title": goal.name,
                 "description": goal.value,
-                "icon": self._infer_icon(goal.value),
-                "quantified": "$" in goal.value or "%" in goal.value
+                "icon": infer_icon(goal.value),
+                "quantified": _QUANT_RE.search(goal.value) is not None
             })
         
         return props
@@ -99,12 +130,14 @@ class MintSiteTranspiler:
     def _build_case_studies(self, ast) -> List[Dict[str, Any]]:
         """Build case study placeholders"""
         # Generate based on goals
-        case_studies = []
+        case_studies: List[Dict[str, Any]] = []
+        append = case_studies.append
+        industry = self._infer_vertical(ast.persona.value if ast.persona else "")
         
         for i, goal in enumerate(ast.goals[:3], 1):  # Max 3 case studies
-            case_studies.append({
+            append({
                 "case_id": f"case_{i}",
-                "industry": self._infer_vertical(ast.persona.value if ast.persona else ""),
+                "industry": industry,
                 "challenge": goal.value,
                 "result": f"Achieved {goal.name}",
                 "testimonial_placeholder": True
@@ -112,9 +145,9 @@ class MintSiteTranspiler:
         
         return case_studies
     
-    def _build_cta(self, ast) -> Dict[str, str]:
+    def _build_cta(self, ast, vm: Dict[str, str]) -> Dict[str, str]:
         """Build call-to-action configuration"""
-        cta_variant = next((v.value for v in ast.variants if v.type == "CTA"), "Schedule Consultation")
+        cta_variant = vm.get("CTA", "Schedule Consultation")
         
         return {
             "primary_text": cta_variant,
@@ -142,38 +175,26 @@ class MintSiteTranspiler:
         """Infer industry vertical from text"""
         text_lower = text.lower()
         
-        if any(word in text_lower for word in ['clinical', 'trial', 'cro', 'pharma']):
-            return "clinical_research"
-        elif any(word in text_lower for word in ['saas', 'software', 'tech']):
-            return "technology"
-        elif any(word in text_lower for word in ['manufacturing', 'supply', 'operations']):
-            return "manufacturing"
-        elif any(word in text_lower for word in ['finance', 'banking', 'investment']):
-            return "financial"
-        else:
-            return "professional_services"
+        for word, vertical in _VERTICAL_KEYWORDS.items():
+            if word in text_lower:
+                return vertical
+        return "professional_services"
     
     def _infer_icon(self, goal_text: str) -> str:
         """Infer appropriate icon from goal text"""
         text_lower = goal_text.lower()
         
-        if any(word in text_lower for word in ['cost', 'save', 'burn']):
-            return "dollar-sign"
-        elif any(word in text_lower for word in ['time', 'timeline', 'delay']):
-            return "clock"
-        elif any(word in text_lower for word in ['control', 'oversight', 'manage']):
-            return "shield-check"
-        elif any(word in text_lower for word in ['risk', 'compliance']):
-            return "alert-triangle"
-        else:
-            return "check-circle"
+        for word, icon in _ICON_KEYWORDS.items():
+            if word in text_lower:
+                return icon
+        return "check-circle"
     
     def _generate_urgency(self, ast) -> str:
         """Generate urgency message based on metrics"""
-        high_risk_metrics = [m for m in ast.metrics if m.value > 0.6]
+        # Only the first high-risk metric is reported, so stop at it
+        high_risk = next((m for m in ast.metrics if m.value > 0.6), None)
         
-        if high_risk_metrics:
-            metric_name = high_risk_metrics[0].name
-            return f"High {metric_name} detected - Take action now"
+        if high_risk:
+            return f"High {high_risk.name} detected - Take action now"
         
         return "Limited time offer - Schedule your consultation today"
@@ -3,70 +3,183 @@ RMetrics Transpiler
 Generates metrics computation configuration from ROI-DSL AST
 """
 
-import json
-from typing import Dict, Any
+import re
+from functools import lru_cache
+from typing import Dict, Any, FrozenSet, List, Tuple
+
+from ._cache import OutputCache
+from ._json import dumps
+
+# Separators between identifiers in an RMetric expression
+_NON_WORD_RE = re.compile(r'\W+')
+
+# "<metric> <op> <number>" trigger conditions
+_THRESHOLD_RE = re.compile(r'(\w+)\s*([><=!]+)\s*([\d.]+)')
+
+# Uppercase letters, for splitting camelCase names into words
+_CAMEL_RE = re.compile(r'([A-Z])')
+
+# Gauge bands, identical for every metric widget. One dict is shared by all
+# widgets of an internally built config, which is only serialized;
+# compile_dict() hands out copies.
+_GAUGE_THRESHOLDS = {
+    "good": 0.3,
+    "warning": 0.5,
+    "critical": 0.7
+}
+
+# Trigger severity, indexed by (threshold > 0.5)
+_SEVERITY = ("medium", "high")
+
+# Keyword -> unit/category tables, in priority order (first matching keyword wins)
+_UNIT_KEYWORDS = {
+    'percent': "percentage", 'rate': "percentage",
+    'drift': "index", 'risk': "index",
+    'time': "days",
+    'cost': "dollars",
+}
+
+_CATEGORY_KEYWORDS = {
+    'risk': "risk", 'drift': "risk", 'variance': "risk",
+    'cost': "financial", 'burn': "financial", 'spend': "financial",
+    'timeline': "temporal", 'delay': "temporal", 'schedule': "temporal",
+    'quality': "quality", 'compliance': "quality",
+}
 
 
 class RMetricsTranspiler:
     """Transpiles ROI-DSL to RMetrics configuration"""
     
+    __slots__ = ('_cache',)
+    
+    def __init__(self) -> None:
+        self._cache = OutputCache(('persona', 'metrics', 'rmetrics', 'triggers'))
+    
     def compile(self, ast) -> str:
         """Generate RMetrics configuration JSON"""
+        # Re-transpiling an identical definition returns the cached output
+        return self._cache.get(ast, self._compile)
+    
+    def compile_binary(self, ast) -> bytes:
+        """Generate the RMetrics configuration as MessagePack (same schema as compile)"""
+        # Imported here so the JSON paths never pay for the optional packages
+        try:
+            import ormsgpack as msgpack  # type: ignore[import-not-found, import-untyped, unused-ignore]
+        except ImportError:
+            try:
+                import msgpack  # type: ignore[import-not-found, import-untyped, no-redef, unused-ignore]
+            except ImportError:
+                raise ImportError(
+                    "MessagePack output needs ormsgpack or msgpack: pip install roi-dsl-compiler[msgpack]"
+                ) from None
+        return msgpack.packb(self._build_config(ast))
+    
+    def _compile(self, ast) -> str:
+        """Build and serialize the metrics config"""
+        return dumps(self._build_config(ast))
+    
+    def compile_dict(self, ast) -> Dict[str, Any]:
+        """
+        Generate the RMetrics configuration as a dict
+        For callers that merge or edit the config before serializing it;
+        the result shares no state and is safe to mutate.
+        """
+        config = self._build_config(ast)
+        for widget in config["dashboard_config"]["widgets"]:
+            if "thresholds" in widget:
+                widget["thresholds"] = dict(widget["thresholds"])
+        return config
+    
+    def _build_config(self, ast) -> Dict[str, Any]:
+        """Build the metrics config"""
         
+        # Dashboard widgets are emitted alongside their metric entries
+        widgets: List[Dict[str, Any]] = []
+        base_metrics = self._extract_base_metrics(ast, widgets)
+        computed_metrics = self._extract_computed_metrics(ast, widgets)
+        thresholds, alerts = self._extract_trigger_rules(ast)
         config = {
             "metrics_engine_version": "2.1",
-            "base_metrics": self._extract_base_metrics(ast),
-            "computed_metrics": self._extract_computed_metrics(ast),
-            "thresholds": self._extract_thresholds(ast),
-            "alerts": self._build_alerts(ast),
-            "dashboard_config": self._build_dashboard(ast)
+            "base_metrics": base_metrics,
+            "computed_metrics": computed_metrics,
+            "thresholds": thresholds,
+            "alerts": alerts,
+            "dashboard_config": self._build_dashboard(ast, widgets)
         }
         
-        return json.dumps(config, indent=2)
+        return config
     
-    def _extract_base_metrics(self, ast) -> Dict[str, Any]:
-        """Extract base metrics"""
+    def _extract_base_metrics(self, ast, widgets: list) -> Dict[str, Any]:
+        """Extract base metrics, adding a gauge widget for each"""
         metrics = {}
+        add_widget = widgets.append
+        classify = _classify_metric
+        display = _format_display_name
         
         for metric in ast.metrics:
-            metrics[metric.name] = {
+            name = metric.name
+            unit, category = classify(name)
+            display_name = display(name)
+            metrics[name] = {
                 "current_value": metric.value,
                 "data_type": "float",
-                "unit": self._infer_unit(metric.name),
-                "display_name": self._format_display_name(metric.name),
-                "category": self._categorize_metric(metric.name)
+                "unit": unit,
+                "display_name": display_name,
+                "category": category
             }
+            add_widget({
+                "type": "gauge",
+                "metric": name,
+                "title": display_name,
+                "thresholds": _GAUGE_THRESHOLDS
+            })
         
         return metrics
     
-    def _extract_computed_metrics(self, ast) -> Dict[str, Any]:
-        """Extract computed (RMetric) metrics"""
+    def _extract_computed_metrics(self, ast, widgets: list) -> Dict[str, Any]:
+        """Extract computed (RMetric) metrics, adding a score card for each"""
         computed = {}
+        metric_names = frozenset(m.name for m in ast.metrics)
+        add_widget = widgets.append
+        display = _format_display_name
+        dependencies = self._extract_dependencies
         
         for rmetric in ast.rmetrics:
-            computed[rmetric.name] = {
-                "expression": rmetric.expr,
-                "dependencies": self._extract_dependencies(rmetric.expr, ast),
-                "display_name": self._format_display_name(rmetric.name),
+            name = rmetric.name
+            expr = rmetric.expr
+            display_name = display(name)
+            computed[name] = {
+                "expression": expr,
+                "dependencies": dependencies(expr, metric_names),
+                "display_name": display_name,
                 "computation_type": "formula"
             }
+            add_widget({
+                "type": "score_card",
+                "metric": name,
+                "title": display_name,
+                "formula": expr
+            })
         
         return computed
     
-    def _extract_dependencies(self, expr: str, ast) -> list:
+    def _extract_dependencies(self, expr: str, metric_names: FrozenSet[str]) -> list:
         """Extract metric dependencies from expression"""
-        import re
-        metric_names = {m.name for m in ast.metrics}
-        tokens = re.findall(r'\b[A-Z]\w+\b', expr)
-        return [t for t in tokens if t in metric_names]
+        # Same tokens as \b[A-Z]\w+\b: word runs of 2+ chars starting A-Z
+        return [
+            t for t in _NON_WORD_RE.split(expr)
+            if t in metric_names and len(t) > 1 and 'A' <= t[0] <= 'Z'
+        ]
     
-    def _extract_thresholds(self, ast) -> Dict[str, Any]:
-        """Extract threshold configurations from triggers"""
+    def _extract_trigger_rules(self, ast) -> Tuple[Dict[str, Any], list]:
+        """Build threshold and alert configurations from triggers in one pass"""
         thresholds = {}
+        alerts: List[Dict[str, Any]] = []
+        add_alert = alerts.append
+        match_threshold = _THRESHOLD_RE.match
         
         for trigger in ast.triggers:
-            import re
-            match = re.match(r'(\w+)\s*([><=!]+)\s*([\d.]+)', trigger.condition)
+            match = match_threshold(trigger.condition)
             if match:
                 metric_name = match.group(1)
                 operator = match.group(2)
@@ -76,98 +189,53 @@ class RMetricsTranspiler:
                     "operator": operator,
                     "threshold": value,
                     "action": trigger.action,
-                    "severity": "high" if value > 0.5 else "medium"
+                    "severity": _SEVERITY[value > 0.5]
                 }
-        
-        return thresholds
-    
-    def _build_alerts(self, ast) -> list:
-        """Build alert configurations"""
-        alerts = []
-        
-        for trigger in ast.triggers:
-            import re
-            match = re.match(r'(\w+)\s*([><=!]+)\s*([\d.]+)', trigger.condition)
-            if match:
-                metric_name = match.group(1)
                 
-                alert = {
+                add_alert({
                     "alert_id": f"alert_{metric_name}",
                     "metric": metric_name,
                     "condition": trigger.condition,
                     "action": trigger.action,
                     "notification_channels": ["email", "slack"],
                     "frequency": "immediate"
-                }
-                
-                alerts.append(alert)
+                })
         
-        return alerts
+        return thresholds, alerts
     
-    def _build_dashboard(self, ast) -> Dict[str, Any]:
+    def _build_dashboard(self, ast, widgets: list) -> Dict[str, Any]:
         """Build dashboard configuration"""
-        dashboard = {
+        return {
             "title": f"{ast.persona.value if ast.persona else 'ROI'} Dashboard",
-            "widgets": []
+            "widgets": widgets
         }
-        
-        # Add metric widgets
-        for metric in ast.metrics:
-            dashboard["widgets"].append({
-                "type": "gauge",
-                "metric": metric.name,
-                "title": self._format_display_name(metric.name),
-                "thresholds": {
-                    "good": 0.3,
-                    "warning": 0.5,
-                    "critical": 0.7
-                }
-            })
-        
-        # Add computed metric widgets
-        for rmetric in ast.rmetrics:
-            dashboard["widgets"].append({
-                "type": "score_card",
-                "metric": rmetric.name,
-                "title": self._format_display_name(rmetric.name),
-                "formula": rmetric.expr
-            })
-        
-        return dashboard
-    
-    def _infer_unit(self, metric_name: str) -> str:
-        """Infer unit from metric name"""
-        name_lower = metric_name.lower()
-        
-        if 'percent' in name_lower or 'rate' in name_lower:
-            return "percentage"
-        elif 'drift' in name_lower or 'risk' in name_lower:
-            return "index"
-        elif 'time' in name_lower:
-            return "days"
-        elif 'cost' in name_lower:
-            return "dollars"
-        else:
-            return "score"
-    
-    def _format_display_name(self, name: str) -> str:
-        """Format camelCase to Display Name"""
-        import re
-        # Insert space before capital letters
-        spaced = re.sub(r'([A-Z])', r' \1', name)
-        return spaced.strip()
-    
-    def _categorize_metric(self, metric_name: str) -> str:
-        """Categorize metric by type"""
-        name_lower = metric_name.lower()
-        
-        if any(word in name_lower for word in ['risk', 'drift', 'variance']):
-            return "risk"
-        elif any(word in name_lower for word in ['cost', 'burn', 'spend']):
-            return "financial"
-        elif any(word in name_lower for word in ['timeline', 'delay', 'schedule']):
-            return "temporal"
-        elif any(word in name_lower for word in ['quality', 'compliance']):
-            return "quality"
-        else:
-            return "operational"
+
+
+# Name classifiers are pure and see the same names repeatedly across metrics,
+# widgets and recompiles, so their results are memoized
+@lru_cache(maxsize=4096)
+def _format_display_name(name: str) -> str:
+    """Format camelCase to Display Name"""
+    # Insert space before capital letters
+    spaced = _CAMEL_RE.sub(r' \1', name)
+    return spaced.strip()
+
+
+@lru_cache(maxsize=4096)
+def _classify_metric(metric_name: str) -> Tuple[str, str]:
+    """Infer (unit, category) from metric name, lowercasing it once"""
+    name_lower = metric_name.lower()
+
+    unit = "score"
+    for word, value in _UNIT_KEYWORDS.items():
+        if word in name_lower:
+            unit = value
+            break
+
+    category = "operational"
+    for word, value in _CATEGORY_KEYWORDS.items():
+        if word in name_lower:
+            category = value
+            break
+
+    return unit, category
@@ -4,9 +4,171 @@ Generates complete outbound SDR automation sequences from ROI-DSL
 Supports: Email, LinkedIn, SMS, Phone, AI SDR agents
 """
 
-import json
-from typing import Dict, Any, List
 import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+
+from ._cache import OutputCache
+from ._json import dumps
+
+# First dollar amount or percentage in a case study, e.g. "$1.2M" or "40%"
+_CASE_RESULT_RE = re.compile(r'(\$[\d,\.]+[MK]?|\d+%)')
+
+# "<n> days/weeks/months" in a lowercased case study
+_TIMELINE_RE = re.compile(r'(\d+)\s+(days?|weeks?|months?)')
+
+# Dollar amount in a goal, e.g. "$500K"
+_DOLLAR_RE = re.compile(r'\$[\d,\.]+[MK]?')
+
+# Keyword tables scanned against the lowercased goal text. Size and department
+# rules are in priority order (first match wins); every matching industry is kept.
+_COMPANY_SIZE_KEYWORDS = (
+    ("enterprise", ('enterprise', 'global', 'multinational')),
+    ("mid_market", ('mid-market', 'regional')),
+)
+
+_INDUSTRY_KEYWORDS = {
+    "pharmaceutical": ("trial", "clinical", "drug", "fda", "pharma"),
+    "healthcare": ("patient", "hospital", "medical", "healthcare"),
+    "technology": ("saas", "software", "tech", "cloud"),
+    "manufacturing": ("production", "supply chain", "factory"),
+    "financial": ("financial", "banking", "investment"),
+}
+
+_DEPARTMENT_KEYWORDS = (
+    (("clinical", "trial"), ("Clinical Operations", "R&D", "Regulatory")),
+    (("operations",), ("Operations", "COO Office")),
+    (("sales",), ("Sales", "Revenue Operations")),
+)
+
+# SDR actions for a DSL trigger, keyed by the first word found in its
+# lowercased action (checked in order)
+_TRIGGER_SDR_ACTIONS = (
+    ("escalate", ("notify_human_sdr", "send_urgent_email", "attempt_call")),
+    ("alert", ("send_email", "update_lead_score", "add_to_sequence")),
+    ("notify", ("send_email", "slack_notification")),
+)
+_DEFAULT_SDR_ACTIONS = ("log_event",)
+
+# Trigger priorities in order, each matched by one alternation over its
+# keywords in the lowercased condition
+_TRIGGER_PRIORITY_PATTERNS = (
+    ("immediate", re.compile(r'risk|critical|urgent')),
+    ("high", re.compile(r'high|important')),
+)
+
+# Send windows shared by every touch of a channel: email goes out early in the
+# prospect's morning, SMS and calls during business hours
+_EMAIL_SEND_WINDOW = "9am-11am local time"
+_CALL_SEND_WINDOW = "10am-4pm local time"
+
+# Single-line SMS, call and chat scripts. %s is filled from the AST; the
+# {{...}} placeholders are left for the sending platform.
+_SMS_INTRO_TEMPLATE = "Hi {{first_name}}, %s. Are you the right person to discuss this? Reply YES or NO."
+_CALL_OPENER_TEMPLATE = "Hi {{first_name}}, this is {{caller_name}} from {{company}}. I sent you an email about %s. Do you have 2 minutes?"
+_CALL_PITCH_TEMPLATE = "We help {{title}}s prevent %s. Quick question: are you currently tracking %s?"
+_VOICEMAIL_TEMPLATE = "Hi {{first_name}}, {{caller_name}} here. Quick question about %s. I'll send details via email. My direct line is {{phone}}."
+_PROACTIVE_CHAT_TEMPLATE = "Hi! I noticed you're looking at %s. I'm an AI assistant - can I answer any questions?"
+
+
+# Integration and analytics sections carry no AST data, so every config
+# shares these dicts
+_INTEGRATIONS = {
+    "crm": {
+        "platform": "salesforce",  # or HubSpot, Pipedrive
+        "sync_fields": [
+            "lead_source",
+            "campaign_name",
+            "sequence_step",
+            "lead_score",
+            "engagement_level",
+            "last_activity"
+        ],
+        "create_tasks": True,
+        "update_lead_status": True
+    },
+    "email": {
+        "platform": "sendgrid",  # or AWS SES, Mailgun
+        "track_opens": True,
+        "track_clicks": True,
+        "track_replies": True
+    },
+    "linkedin": {
+        "platform": "phantombuster",  # or Expandi, LinkedHelper
+        "daily_connection_limit": 50,
+        "daily_message_limit": 30,
+        "humanize_timing": True
+    },
+    "enrichment": {
+        "platform": "clearbit",  # or ZoomInfo, Apollo
+        "enrich_on": "lead_creation",
+        "append_technographics": True,
+        "append_intent_data": True
+    },
+    "calendar": {
+        "platform": "calendly",  # or Chili Piper
+        "meeting_types": ["discovery_call", "demo", "assessment"],
+        "auto_qualify": True
+    },
+    "notification": {
+        "slack_webhook": "{{SLACK_WEBHOOK_URL}}",
+        "sms_provider": "twilio",
+        "email_alerts": True
+    }
+}
+
+_TRACKING = {
+    "kpis": {
+        "outbound": [
+            "emails_sent",
+            "emails_opened",
+            "emails_clicked",
+            "emails_replied",
+            "linkedin_connections_sent",
+            "linkedin_connections_accepted",
+            "linkedin_messages_sent",
+            "linkedin_messages_replied"
+        ],
+        "conversion": [
+            "leads_qualified",
+            "meetings_booked",
+            "meetings_held",
+            "opportunities_created",
+            "deals_won"
+        ],
+        "velocity": [
+            "response_time",
+            "time_to_qualification",
+            "time_to_meeting",
+            "time_to_opportunity"
+        ]
+    },
+    "attribution": {
+        "model": "first_touch",
+        "track_channel_performance": True,
+        "track_message_performance": True
+    },
+    "dashboards": [
+        "sdr_activity_dashboard",
+        "pipeline_generation_dashboard",
+        "roi_attribution_dashboard"
+    ]
+}
+
+@dataclass(slots=True)
+class _SDRContext:
+    """AST-derived values shared by the section builders, collected in one pass"""
+    first_goal: Any
+    first_metric: Any
+    hero_variant: str
+    goal_values: Tuple[str, ...]
+    top_metric_names: Tuple[str, ...]
+    first_case: Optional[Tuple[str, str]]
+    goals_text_lower: str
+    industry_text_lower: str
+    goals_bullets: str
+    goals_bullets_top3: str
 
 
 class SDRAutomationTranspiler:
@@ -15,19 +177,27 @@ class SDRAutomationTranspiler:
     Generates multi-channel sequences with AI personalization
     """
     
+    def __init__(self) -> None:
+        self._cache = OutputCache(('persona', 'goals', 'metrics', 'case_studies', 'variants', 'triggers'))
+    
     def compile(self, ast) -> str:
         """Generate complete SDR automation configuration"""
-        
+        # Re-transpiling an identical definition returns the cached output
+        return self._cache.get(ast, self._compile)
+    
+    def _compile(self, ast) -> str:
+        """Build and serialize the configuration, bypassing the cache"""
+        ctx = self._collect(ast)
         config = {
             "campaign_version": "2.1",
             "campaign_type": "value_first_outbound",
             
             # Persona & targeting
-            "target_persona": self._build_persona(ast),
-            "icp_filters": self._build_icp_filters(ast),
+            "target_persona": self._build_persona(ast, ctx),
+            "icp_filters": self._build_icp_filters(ast, ctx),
             
             # Multi-channel sequences
-            "sequences": self._build_sequences(ast),
+            "sequences": self._build_sequences(ast, ctx),
             
             # AI SDR agent config
             "ai_sdr": self._build_ai_sdr(ast),
@@ -39,63 +209,90 @@ class SDRAutomationTranspiler:
             "triggers": self._build_triggers(ast),
             
             # Integrations
-            "integrations": self._build_integrations(ast),
+            "integrations": _INTEGRATIONS,
             
             # Analytics
-            "tracking": self._build_tracking(ast)
+            "tracking": _TRACKING
         }
         
-        return json.dumps(config, indent=2)
+        return dumps(config)
     
-    def _build_persona(self, ast) -> Dict[str, Any]:
+    def _collect(self, ast) -> _SDRContext:
+        """Walk goals, metrics and variants once for everything the builders reuse"""
+        goal_values = tuple(g.value for g in ast.goals)
+        goals_text = " ".join(goal_values)
+        persona_text = ast.persona.value if ast.persona else ""
+        
+        hero_variant = "Transform Your Operations"
+        for v in ast.variants:
+            if v.type == "Hero":
+                hero_variant = v.value
+                break
+        
+        bullets = [f"• {value}" for value in goal_values]
+        
+        return _SDRContext(
+            first_goal=ast.goals[0] if ast.goals else None,
+            first_metric=ast.metrics[0] if ast.metrics else None,
+            hero_variant=hero_variant,
+            goal_values=goal_values,
+            top_metric_names=tuple(m.name for m in ast.metrics[:3]),
+            first_case=next(iter(ast.case_studies.items()), None),
+            goals_text_lower=goals_text.lower(),
+            industry_text_lower=" ".join((*goal_values, persona_text)).lower(),
+            goals_bullets="\n".join(bullets),
+            goals_bullets_top3="\n".join(bullets[:3]),
+        )
+    
+    def _build_persona(self, ast, ctx: _SDRContext) -> Dict[str, Any]:
         """Build target persona for SDR campaigns"""
         persona = {
             "primary_role": ast.persona.name if ast.persona else "Unknown",
             "description": ast.persona.value if ast.persona else "",
-            "pain_points": [g.value for g in ast.goals],
-            "value_props": self._extract_value_props(ast),
+            "pain_points": ctx.goal_values,
+            "value_props": self._extract_value_props(ctx),
             "firmographic_filters": {
-                "company_size": self._infer_company_size(ast),
-                "industries": self._infer_industries(ast),
+                "company_size": self._infer_company_size(ctx),
+                "industries": self._infer_industries(ctx),
                 "technologies": self._infer_technologies(ast)
             }
         }
         
         return persona
     
-    def _build_icp_filters(self, ast) -> Dict[str, Any]:
+    def _build_icp_filters(self, ast, ctx: _SDRContext) -> Dict[str, Any]:
         """Build ideal customer profile filters for targeting"""
         return {
             "job_titles": self._generate_job_titles(ast),
             "seniority_levels": ["Director", "VP", "C-Level"],
-            "departments": self._infer_departments(ast),
+            "departments": self._infer_departments(ctx),
             "company_size": {
                 "min_employees": 50,
                 "max_employees": 10000
             },
             "exclude_keywords": ["student", "intern", "retired"],
-            "intent_signals": self._build_intent_signals(ast)
+            "intent_signals": self._build_intent_signals(ctx)
         }
     
-    def _build_sequences(self, ast) -> Dict[str, List[Dict[str, Any]]]:
+    def _build_sequences(self, ast, ctx: _SDRContext) -> Dict[str, List[Dict[str, Any]]]:
         """Build multi-channel outbound sequences"""
         
         sequences = {
-            "email": self._build_email_sequence(ast),
-            "linkedin": self._build_linkedin_sequence(ast),
-            "sms": self._build_sms_sequence(ast),
-            "phone": self._build_phone_sequence(ast),
-            "ai_chat": self._build_ai_chat_sequence(ast)
+            "email": self._build_email_sequence(ast, ctx),
+            "linkedin": self._build_linkedin_sequence(ctx),
+            "sms": self._build_sms_sequence(ctx),
+            "phone": self._build_phone_sequence(ast, ctx),
+            "ai_chat": self._build_ai_chat_sequence(ctx)
         }
         
         return sequences
     
-    def _build_email_sequence(self, ast) -> List[Dict[str, Any]]:
+    def _build_email_sequence(self, ast, ctx: _SDRContext) -> List[Dict[str, Any]]:
         """Build 7-touch email sequence"""
         
-        primary_goal = ast.goals[0] if ast.goals else None
-        primary_metric = ast.metrics[0] if ast.metrics else None
-        hero_variant = next((v.value for v in ast.variants if v.type == "Hero"), "Transform Your Operations")
+        primary_goal = ctx.first_goal
+        primary_metric = ctx.first_metric
+        hero_variant = ctx.hero_variant
         
         sequence = [
             # Email 1: Problem awareness (Day 0)
@@ -117,7 +314,7 @@ Best,
 {{{{sender_name}}}}""",
                 "personalization_tokens": ["first_name", "company", "industry", "title", "sender_name"],
                 "ai_personalization": True,
-                "send_window": "9am-11am local time"
+                "send_window": _EMAIL_SEND_WINDOW
             },
             
             # Email 2: Value prop (Day 2)
@@ -131,9 +328,9 @@ Following up on my previous email about {primary_goal.value if primary_goal else
 
 Here's what we typically help {{{{title}}}}s achieve:
 
-{self._format_goals_as_bullets(ast.goals)}
+{ctx.goals_bullets}
 
-One client ({{{{case_study_company}}}}) saw {self._extract_case_study_result(ast)} in just {self._extract_timeline(ast)}.
+One client ({{{{case_study_company}}}}) saw {self._extract_case_study_result(ctx)} in just {self._extract_timeline(ctx)}.
 
 Want to see how this applies to {{{{company}}}}?
 
@@ -143,7 +340,7 @@ Best,
 {{{{sender_name}}}}""",
                 "personalization_tokens": ["first_name", "company", "title", "case_study_company", "calendar_link", "sender_name"],
                 "ai_personalization": True,
-                "send_window": "9am-11am local time",
+                "send_window": _EMAIL_SEND_WINDOW,
                 "conditions": {
                     "send_if": "no_reply_to_email_1"
                 }
@@ -154,10 +351,10 @@ Best,
                 "day": 5,
                 "type": "case_study",
                 "subject": "How {{case_study_company}} prevented {{result}}",
-                "body_template": self._generate_case_study_email(ast),
+                "body_template": self._generate_case_study_email(ctx),
                 "personalization_tokens": ["first_name", "company", "case_study_company", "result", "sender_name"],
                 "ai_personalization": True,
-                "send_window": "9am-11am local time",
+                "send_window": _EMAIL_SEND_WINDOW,
                 "conditions": {
                     "send_if": "no_reply_to_email_2"
                 }
@@ -168,10 +365,10 @@ Best,
                 "day": 8,
                 "type": "risk_urgency",
                 "subject": "{{first_name}}, the cost of waiting",
-                "body_template": self._generate_risk_email(ast),
+                "body_template": self._generate_risk_email(ctx),
                 "personalization_tokens": ["first_name", "company", "cost", "sender_name"],
                 "ai_personalization": True,
-                "send_window": "9am-11am local time",
+                "send_window": _EMAIL_SEND_WINDOW,
                 "conditions": {
                     "send_if": "no_reply_to_email_3"
                 }
@@ -196,7 +393,7 @@ All the best,
 P.S. - If you're seeing {metric_name} above {threshold}%, we should definitely talk. That's when most companies see serious issues.""",
                 "personalization_tokens": ["first_name", "company", "primary_goal", "metric_name", "threshold", "sender_name"],
                 "ai_personalization": True,
-                "send_window": "9am-11am local time",
+                "send_window": _EMAIL_SEND_WINDOW,
                 "conditions": {
                     "send_if": "no_reply_to_email_4"
                 }
@@ -210,7 +407,7 @@ P.S. - If you're seeing {metric_name} above {threshold}%, we should definitely t
                 "body_template": self._generate_reengagement_email(ast),
                 "personalization_tokens": ["first_name", "company", "metric_name", "industry", "sender_name"],
                 "ai_personalization": True,
-                "send_window": "9am-11am local time",
+                "send_window": _EMAIL_SEND_WINDOW,
                 "conditions": {
                     "send_if": "no_reply_to_sequence"
                 }
@@ -219,7 +416,7 @@ P.S. - If you're seeing {metric_name} above {threshold}%, we should definitely t
         
         return sequence
     
-    def _build_linkedin_sequence(self, ast) -> List[Dict[str, Any]]:
+    def _build_linkedin_sequence(self, ctx: _SDRContext) -> List[Dict[str, Any]]:
         """Build LinkedIn outreach sequence"""
         
         return [
@@ -229,7 +426,7 @@ P.S. - If you're seeing {metric_name} above {threshold}%, we should definitely t
                 "type": "connection_request",
                 "message_template": f"""Hi {{{{first_name}}}},
 
-I help {{{{title}}}}s in {{{{industry}}}} with {ast.goals[0].value if ast.goals else 'operational excellence'}. 
+I help {{{{title}}}}s in {{{{industry}}}} with {ctx.first_goal.value if ctx.first_goal else 'operational excellence'}. 
 
 Would love to connect and share some insights relevant to {{{{company}}}}.
 
@@ -246,10 +443,10 @@ Best,
                 "condition": "connection_accepted",
                 "message_template": f"""Thanks for connecting, {{{{first_name}}}}!
 
-I noticed {{{{company}}}} is {self._infer_company_activity(ast)}. 
+I noticed {{{{company}}}} is {self._infer_company_activity()}. 
 
 We've helped similar companies achieve:
-{self._format_goals_as_bullets(ast.goals, max_items=3)}
+{ctx.goals_bullets_top3}
 
 Worth a quick chat to see if there's a fit?
 
@@ -286,16 +483,16 @@ Let me know what you think!""",
             }
         ]
     
-    def _build_sms_sequence(self, ast) -> List[Dict[str, Any]]:
+    def _build_sms_sequence(self, ctx: _SDRContext) -> List[Dict[str, Any]]:
         """Build SMS sequence (for opted-in contacts only)"""
         
         return [
             {
                 "day": 0,
                 "type": "intro_sms",
-                "message_template": f"Hi {{{{first_name}}}}, {ast.goals[0].value if ast.goals else 'quick question about your operations'}. Are you the right person to discuss this? Reply YES or NO.",
+                "message_template": _SMS_INTRO_TEMPLATE % (ctx.first_goal.value if ctx.first_goal else 'quick question about your operations'),
                 "character_limit": 160,
-                "send_window": "10am-4pm local time",
+                "send_window": _CALL_SEND_WINDOW,
                 "require_opt_in": True
             },
             {
@@ -304,7 +501,7 @@ Let me know what you think!""",
                 "condition": "replied_yes",
                 "message_template": "Great! We help companies prevent {risk}. Can I send you a quick 60-sec ROI calculator? Reply CALC for link.",
                 "character_limit": 160,
-                "send_window": "10am-4pm local time"
+                "send_window": _CALL_SEND_WINDOW
             },
             {
                 "day": 2,
@@ -312,23 +509,29 @@ Let me know what you think!""",
                 "condition": "engaged",
                 "message_template": "Based on your input, I see {{estimated_value}}. Worth a 15-min call? {{calendar_link}}",
                 "character_limit": 160,
-                "send_window": "10am-4pm local time"
+                "send_window": _CALL_SEND_WINDOW
             }
         ]
     
-    def _build_phone_sequence(self, ast) -> List[Dict[str, Any]]:
+    def _build_phone_sequence(self, ast, ctx: _SDRContext) -> List[Dict[str, Any]]:
         """Build phone call sequence with scripts"""
         
+        primary_goal = ctx.first_goal
+        primary_metric = ctx.first_metric
+        
         return [
             {
                 "attempt": 1,
                 "day": 3,
                 "type": "discovery_call",
                 "call_script": {
-                    "opener": f"Hi {{{{first_name}}}}, this is {{{{caller_name}}}} from {{{{company}}}}. I sent you an email about {ast.goals[0].value if ast.goals else 'operational improvements'}. Do you have 2 minutes?",
-                    "pitch": f"We help {{{{title}}}}s prevent {self._extract_primary_risk(ast)}. Quick question: are you currently tracking {ast.metrics[0].name if ast.metrics else 'key metrics'}?",
+                    "opener": _CALL_OPENER_TEMPLATE % (primary_goal.value if primary_goal else 'operational improvements'),
+                    "pitch": _CALL_PITCH_TEMPLATE % (
+                        self._extract_primary_risk(ast),
+                        primary_metric.name if primary_metric else 'key metrics',
+                    ),
                     "qualifying_questions": [
-                        f"How would you rate your current {m.name}?" for m in ast.metrics[:3]
+                        f"How would you rate your current {name}?" for name in ctx.top_metric_names
                     ],
                     "objection_handlers": {
                         "no_time": "I understand. Can I send you a 60-second ROI calculator instead? Takes less time than this call.",
@@ -337,29 +540,33 @@ Let me know what you think!""",
                     },
                     "close": "Based on what you shared, I think there's a fit. Can we schedule 15 minutes next week to dive deeper?"
                 },
-                "voicemail_script": f"Hi {{{{first_name}}}}, {{{{caller_name}}}} here. Quick question about {ast.goals[0].value if ast.goals else 'your operations'}. I'll send details via email. My direct line is {{{{phone}}}}.",
-                "call_window": "10am-4pm local time",
+                "voicemail_script": _VOICEMAIL_TEMPLATE % (primary_goal.value if primary_goal else 'your operations'),
+                "call_window": _CALL_SEND_WINDOW,
                 "max_attempts": 3
             }
         ]
     
-    def _build_ai_chat_sequence(self, ast) -> List[Dict[str, Any]]:
+    def _build_ai_chat_sequence(self, ctx: _SDRContext) -> List[Dict[str, Any]]:
         """Build AI SDR chat bot sequence"""
         
+        # Both chats walk the same flow; building it once is enough since the
+        # result is only serialized
+        flow = self._build_chat_flow(ctx)
+        
         return [
             {
                 "trigger": "website_visit",
                 "type": "proactive_chat",
                 "delay_seconds": 15,
-                "message": f"Hi! I noticed you're looking at {ast.goals[0].value if ast.goals else 'our services'}. I'm an AI assistant - can I answer any questions?",
-                "conversation_flow": self._build_chat_flow(ast)
+                "message": _PROACTIVE_CHAT_TEMPLATE % (ctx.first_goal.value if ctx.first_goal else 'our services'),
+                "conversation_flow": flow
             },
             {
                 "trigger": "form_abandonment",
                 "type": "recovery_chat",
                 "delay_seconds": 5,
                 "message": "Before you go - quick question: what's your biggest challenge with {pain_point}?",
-                "conversation_flow": self._build_chat_flow(ast)
+                "conversation_flow": flow
             }
         ]
     
@@ -506,132 +713,27 @@ Let me know what you think!""",
         
         return triggers
     
-    def _build_integrations(self, ast) -> Dict[str, Any]:
-        """Build integration configs"""
-        
-        return {
-            "crm": {
-                "platform": "salesforce",  # or HubSpot, Pipedrive
-                "sync_fields": [
-                    "lead_source",
-                    "campaign_name",
-                    "sequence_step",
-                    "lead_score",
-                    "engagement_level",
-                    "last_activity"
-                ],
-                "create_tasks": True,
-                "update_lead_status": True
-            },
-            "email": {
-                "platform": "sendgrid",  # or AWS SES, Mailgun
-                "track_opens": True,
-                "track_clicks": True,
-                "track_replies": True
-            },
-            "linkedin": {
-                "platform": "phantombuster",  # or Expandi, LinkedHelper
-                "daily_connection_limit": 50,
-                "daily_message_limit": 30,
-                "humanize_timing": True
-            },
-            "enrichment": {
-                "platform": "clearbit",  # or ZoomInfo, Apollo
-                "enrich_on": "lead_creation",
-                "append_technographics": True,
-                "append_intent_data": True
-            },
-            "calendar": {
-                "platform": "calendly",  # or Chili Piper
-                "meeting_types": ["discovery_call", "demo", "assessment"],
-                "auto_qualify": True
-            },
-            "notification": {
-                "slack_webhook": "{{SLACK_WEBHOOK_URL}}",
-                "sms_provider": "twilio",
-                "email_alerts": True
-            }
-        }
-    
-    def _build_tracking(self, ast) -> Dict[str, Any]:
-        """Build analytics tracking config"""
-        
-        return {
-            "kpis": {
-                "outbound": [
-                    "emails_sent",
-                    "emails_opened",
-                    "emails_clicked",
-                    "emails_replied",
-                    "linkedin_connections_sent",
-                    "linkedin_connections_accepted",
-                    "linkedin_messages_sent",
-                    "linkedin_messages_replied"
-                ],
-                "conversion": [
-                    "leads_qualified",
-                    "meetings_booked",
-                    "meetings_held",
-                    "opportunities_created",
-                    "deals_won"
-                ],
-                "velocity": [
-                    "response_time",
-                    "time_to_qualification",
-                    "time_to_meeting",
-                    "time_to_opportunity"
-                ]
-            },
-            "attribution": {
-                "model": "first_touch",
-                "track_channel_performance": True,
-                "track_message_performance": True
-            },
-            "dashboards": [
-                "sdr_activity_dashboard",
-                "pipeline_generation_dashboard",
-                "roi_attribution_dashboard"
-            ]
-        }
-    
     # ==========================================
     # Helper Methods
     # ==========================================
     
-    def _extract_value_props(self, ast) -> List[str]:
+    def _extract_value_props(self, ctx: _SDRContext) -> List[str]:
         """Extract value propositions from goals"""
-        return [g.value for g in ast.goals[:3]]
+        return list(ctx.goal_values[:3])
     
-    def _infer_company_size(self, ast) -> str:
+    def _infer_company_size(self, ctx: _SDRContext) -> str:
         """Infer target company size from context"""
         # Look for keywords in goals/metrics
-        text = " ".join([g.value for g in ast.goals])
+        text = ctx.goals_text_lower
         
-        if any(word in text.lower() for word in ['enterprise', 'global', 'multinational']):
-            return "enterprise"
-        elif any(word in text.lower() for word in ['mid-market', 'regional']):
-            return "mid_market"
-        else:
-            return "smb"
-    
-    def _infer_industries(self, ast) -> List[str]:
+        for size, keywords in _COMPANY_SIZE_KEYWORDS:
+            if any(word in text for word in keywords):
+                return size
+        return "smb"
+    
+    def _infer_industries(self, ctx: _SDRContext) -> List[str]:
         """Infer target industries"""
-        industries = []
-        text = " ".join([g.value for g in ast.goals] + [ast.persona.value if ast.persona else ""])
-        
-        industry_keywords = {
-            "pharmaceutical": ["trial", "clinical", "drug", "fda", "pharma"],
-            "healthcare": ["patient", "hospital", "medical", "healthcare"],
-            "technology": ["saas", "software", "tech", "cloud"],
-            "manufacturing": ["production", "supply chain", "factory"],
-            "financial": ["financial", "banking", "investment"]
-        }
-        
-        for industry, keywords in industry_keywords.items():
-            if any(kw in text.lower() for kw in keywords):
-                industries.append(industry)
-        
-        return industries or ["technology"]
+        return list(_industries_for(ctx.industry_text_lower))
     
     def _infer_technologies(self, ast) -> List[str]:
         """Infer technologies used by prospects"""
@@ -651,57 +753,42 @@ Let me know what you think!""",
             return titles
         return ["Director", "VP", "C-Level"]
     
-    def _infer_departments(self, ast) -> List[str]:
+    def _infer_departments(self, ctx: _SDRContext) -> List[str]:
         """Infer target departments"""
-        text = " ".join([g.value for g in ast.goals])
-        
-        if "clinical" in text.lower() or "trial" in text.lower():
-            return ["Clinical Operations", "R&D", "Regulatory"]
-        elif "operations" in text.lower():
-            return ["Operations", "COO Office"]
-        elif "sales" in text.lower():
-            return ["Sales", "Revenue Operations"]
-        
-        return ["Operations"]
+        return list(_departments_for(ctx.goals_text_lower))
     
-    def _build_intent_signals(self, ast) -> List[str]:
+    def _build_intent_signals(self, ctx: _SDRContext) -> List[str]:
         """Build intent signals to track"""
         return [
-            f"searching for {ast.goals[0].name if ast.goals else 'solutions'}",
+            f"searching for {ctx.first_goal.name if ctx.first_goal else 'solutions'}",
             "visiting competitor websites",
             "downloading industry reports",
             "attending relevant webinars"
         ]
     
-    def _format_goals_as_bullets(self, goals, max_items=None) -> str:
-        """Format goals as bullet list"""
-        items = goals[:max_items] if max_items else goals
-        return "\n".join([f"• {g.value}" for g in items])
-    
-    def _extract_case_study_result(self, ast) -> str:
+    def _extract_case_study_result(self, ctx: _SDRContext) -> str:
         """Extract quantified result from case studies"""
-        if ast.case_studies:
-            first_case = list(ast.case_studies.values())[0]
+        if ctx.first_case:
+            first_case = ctx.first_case[1]
             # Extract numbers/percentages
-            match = re.search(r'(\$[\d,\.]+[MK]?|\d+%)', first_case)
+            match = _CASE_RESULT_RE.search(first_case)
             if match:
                 return match.group(1)
         return "$2.4M saved"
     
-    def _extract_timeline(self, ast) -> str:
+    def _extract_timeline(self, ctx: _SDRContext) -> str:
         """Extract timeline from case studies"""
-        if ast.case_studies:
-            first_case = list(ast.case_studies.values())[0]
-            match = re.search(r'(\d+)\s+(days?|weeks?|months?)', first_case.lower())
+        if ctx.first_case:
+            first_case = ctx.first_case[1]
+            match = _TIMELINE_RE.search(first_case.lower())
             if match:
                 return f"{match.group(1)} {match.group(2)}"
         return "90 days"
     
-    def _generate_case_study_email(self, ast) -> str:
+    def _generate_case_study_email(self, ctx: _SDRContext) -> str:
         """Generate case study email body"""
-        if ast.case_studies:
-            case_name = list(ast.case_studies.keys())[0]
-            case_desc = list(ast.case_studies.values())[0]
+        if ctx.first_case:
+            case_name, case_desc = ctx.first_case
             
             return f"""{{{{first_name}}}},
 
@@ -719,20 +806,21 @@ Best time for a quick call?
         
         return "Case study email"
     
-    def _generate_risk_email(self, ast) -> str:
+    def _generate_risk_email(self, ctx: _SDRContext) -> str:
         """Generate risk/urgency email"""
-        primary_metric = ast.metrics[0] if ast.metrics else None
+        primary_metric = ctx.first_metric
         
         if primary_metric:
+            pct = int(primary_metric.value * 100)
             return f"""{{{{first_name}}}},
 
 Quick note on timing.
 
-Based on industry data, when {primary_metric.name} reaches {int(primary_metric.value * 100)}%, companies typically see {{{{negative_outcome}}}} within 60-90 days.
+Based on industry data, when {primary_metric.name} reaches {pct}%, companies typically see {{{{negative_outcome}}}} within 60-90 days.
 
 Not trying to create urgency artificially - just sharing what we've observed.
 
-If you're already above {int(primary_metric.value * 100)}%, worth having a conversation sooner rather than later.
+If you're already above {pct}%, worth having a conversation sooner rather than later.
 
 Calendar: {{{{calendar_link}}}}
 
@@ -756,7 +844,7 @@ Let me know if you want to discuss.
 
 {{sender_name}}"""
     
-    def _infer_company_activity(self, ast) -> str:
+    def _infer_company_activity(self) -> str:
         """Infer what the company is doing based on context"""
         return "growing rapidly" 
     
@@ -766,12 +854,12 @@ Let me know if you want to discuss.
             first_goal = ast.goals[0].value
             if '$' in first_goal:
                 # Extract dollar amount
-                match = re.search(r'\$[\d,\.]+[MK]?', first_goal)
+                match = _DOLLAR_RE.search(first_goal)
                 if match:
                     return f"{match.group(0)} in losses"
         return "operational issues"
     
-    def _build_chat_flow(self, ast) -> List[Dict[str, Any]]:
+    def _build_chat_flow(self, ctx: _SDRContext) -> List[Dict[str, Any]]:
         """Build AI chat conversation flow"""
         return [
             {
@@ -782,12 +870,12 @@ Let me know if you want to discuss.
             {
                 "step": 2,
                 "type": "qualification",
-                "message": f"I help companies with {ast.goals[0].value if ast.goals else 'operations'}. Is this relevant to you?"
+                "message": f"I help companies with {ctx.first_goal.value if ctx.first_goal else 'operations'}. Is this relevant to you?"
             },
             {
                 "step": 3,
                 "type": "discovery",
-                "questions": [f"How would you describe your {m.name}?" for m in ast.metrics[:3]]
+                "questions": [f"How would you describe your {name}?" for name in ctx.top_metric_names]
             },
             {
                 "step": 4,
@@ -824,26 +912,41 @@ Let me know if you want to discuss.
             scoring[f"{metric.name}_above_threshold"] = int(metric.value * 20)
         return scoring
     
-    def _map_trigger_to_sdr_action(self, trigger) -> List[str]:
+    def _map_trigger_to_sdr_action(self, trigger) -> Tuple[str, ...]:
         """Map ROI-DSL trigger to SDR actions"""
         action = trigger.action.lower()
         
-        if "escalate" in action:
-            return ["notify_human_sdr", "send_urgent_email", "attempt_call"]
-        elif "alert" in action:
-            return ["send_email", "update_lead_score", "add_to_sequence"]
-        elif "notify" in action:
-            return ["send_email", "slack_notification"]
-        else:
-            return ["log_event"]
+        for word, sdr_actions in _TRIGGER_SDR_ACTIONS:
+            if word in action:
+                return sdr_actions
+        return _DEFAULT_SDR_ACTIONS
     
     def _assess_trigger_priority(self, trigger) -> str:
         """Assess trigger priority"""
         condition = trigger.condition.lower()
         
-        if any(word in condition for word in ['risk', 'critical', 'urgent']):
-            return "immediate"
-        elif any(word in condition for word in ['high', 'important']):
-            return "high"
-        else:
-            return "medium"
+        for priority, pattern in _TRIGGER_PRIORITY_PATTERNS:
+            if pattern.search(condition):
+                return priority
+        return "medium"
+
+
+# Goal text often stays the same while other blocks are edited, so the
+# keyword scans are cached on the lowered text itself
+@lru_cache(maxsize=256)
+def _industries_for(text: str) -> Tuple[str, ...]:
+    """Industries whose keywords appear in the lowered goal/persona text"""
+    industries = tuple(
+        industry for industry, keywords in _INDUSTRY_KEYWORDS.items()
+        if any(kw in text for kw in keywords)
+    )
+    return industries or ("technology",)
+
+
+@lru_cache(maxsize=256)
+def _departments_for(text: str) -> Tuple[str, ...]:
+    """Departments for the first matching rule in the lowered goal text"""
+    for keywords, departments in _DEPARTMENT_KEYWORDS:
+        if any(word in text for word in keywords):
+            return departments
+    return ("Operations",)
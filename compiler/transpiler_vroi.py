@@ -3,9 +3,35 @@ vROI (Value-of-Avoiding-Delay) Transpiler
 Generates vROI calculator configuration from ROI-DSL AST
 """
 
-import json
 import re
-from typing import Dict, Any, List
+from dataclasses import dataclass
+from typing import Dict, Any, List, Tuple
+
+from ._json import dumps
+
+# "$<amount> M|K" dollar figures in a goal, e.g. "$2.4M" or "$500 K"
+_DOLLAR_RE = re.compile(r'\$(\d+\.?\d*)\s*([MK])')
+
+# Position before each uppercase letter, for splitting camelCase names into
+# words. A zero-width match with a literal replacement skips group expansion.
+_CAMEL_RE = re.compile(r'(?=[A-Z])')
+
+# Value categories in priority order, each matched by one alternation over
+# its keywords in the lowercased goal text
+_VALUE_CATEGORY_PATTERNS = (
+    ("cost_avoidance", re.compile(r'avoid|prevent|reduce')),
+    ("value_gain", re.compile(r'increase|improve|gain')),
+    ("recovery", re.compile(r'restore|regain|recover')),
+)
+
+
+@dataclass(slots=True)
+class _ParsedGoal:
+    """A goal with its dollar figures scanned once per compile"""
+    goal: Any
+    amounts: Tuple[float, ...]
+    is_monthly: bool
+    value_lower: str
 
 
 class vROITranspiler:
@@ -13,18 +39,38 @@ class vROITranspiler:
     
     def compile(self, ast) -> str:
         """Generate vROI calculator JSON"""
+        return dumps(self.compile_dict(ast))
+    
+    def compile_dict(self, ast) -> Dict[str, Any]:
+        """Build the vROI calculator configuration"""
         
+        parsed_goals = self._preparse_goals(ast)
+        cost_avoidance = self._calculate_cost_avoidance(parsed_goals)
         calculator = {
             "calculator_type": "value_of_avoiding_delay",
             "persona": self._extract_persona(ast),
-            "value_drivers": self._extract_value_drivers(ast),
-            "cost_avoidance": self._calculate_cost_avoidance(ast),
-            "timeline_model": self._build_timeline_model(ast),
-            "calculator_inputs": self._define_inputs(ast),
+            "value_drivers": self._extract_value_drivers(parsed_goals),
+            "cost_avoidance": cost_avoidance,
+            "timeline_model": self._build_timeline_model(ast, cost_avoidance),
+            "calculator_inputs": self._define_inputs(ast, parsed_goals),
             "output_format": self._define_output_format(ast)
         }
         
-        return json.dumps(calculator, indent=2)
+        return calculator
+    
+    def _preparse_goals(self, ast) -> List[_ParsedGoal]:
+        """Scan every goal for dollar figures and monthly wording in one pass"""
+        parsed = []
+        for goal in ast.goals:
+            value = goal.value
+            amounts = tuple(
+                float(amount) * (1_000_000 if unit == 'M' else 1_000)
+                for amount, unit in _DOLLAR_RE.findall(value)
+            )
+            value_lower = value.lower()
+            is_monthly = '/mo' in value or 'monthly' in value_lower
+            parsed.append(_ParsedGoal(goal, amounts, is_monthly, value_lower))
+        return parsed
     
     def _extract_persona(self, ast) -> Dict[str, str]:
         """Extract persona for calculator targeting"""
@@ -35,50 +81,41 @@ class vROITranspiler:
             }
         return {"role": "Decision Maker", "description": ""}
     
-    def _extract_value_drivers(self, ast) -> List[Dict[str, Any]]:
+    def _extract_value_drivers(self, parsed_goals: List[_ParsedGoal]) -> List[Dict[str, Any]]:
         """Extract value drivers from goals"""
         drivers = []
         
-        for goal in ast.goals:
-            # Extract dollar values
-            dollar_matches = re.findall(r'\$(\d+\.?\d*)\s*([MK])', goal.value)
+        for parsed in parsed_goals:
+            if not parsed.amounts:
+                continue
+            goal = parsed.goal
+            category = self._categorize_value(parsed.value_lower)
             
-            for match in dollar_matches:
-                amount = float(match[0])
-                multiplier = 1_000_000 if match[1] == 'M' else 1_000
-                total_value = amount * multiplier
-                
+            # One driver per dollar value
+            for total_value in parsed.amounts:
                 drivers.append({
                     "name": goal.name,
                     "description": goal.value,
                     "monthly_value": total_value,
-                    "category": self._categorize_value(goal.value)
+                    "category": category
                 })
         
         return drivers
     
-    def _calculate_cost_avoidance(self, ast) -> Dict[str, Any]:
+    def _calculate_cost_avoidance(self, parsed_goals: List[_ParsedGoal]) -> Dict[str, Any]:
         """Calculate cost avoidance metrics"""
-        total_monthly = 0
-        breakdown = []
-        
-        for goal in ast.goals:
-            dollar_matches = re.findall(r'\$(\d+\.?\d*)\s*([MK])', goal.value)
-            for match in dollar_matches:
-                amount = float(match[0])
-                multiplier = 1_000_000 if match[1] == 'M' else 1_000
-                monthly_value = amount * multiplier
-                
-                # Check if it's monthly
-                if '/mo' in goal.value or 'monthly' in goal.value.lower():
-                    total_monthly += monthly_value
-                    
-                    breakdown.append({
-                        "source": goal.name,
-                        "monthly_cost": monthly_value,
-                        "quarterly_cost": monthly_value * 3,
-                        "annual_cost": monthly_value * 12
-                    })
+        # Only monthly figures count towards the burn rate
+        breakdown = [
+            {
+                "source": parsed.goal.name,
+                "monthly_cost": monthly_value,
+                "quarterly_cost": monthly_value * 3,
+                "annual_cost": monthly_value * 12
+            }
+            for parsed in parsed_goals if parsed.is_monthly
+            for monthly_value in parsed.amounts
+        ]
+        total_monthly = sum(item["monthly_cost"] for item in breakdown)
         
         return {
             "total_monthly_burn": total_monthly,
@@ -87,16 +124,15 @@ class vROITranspiler:
             "breakdown": breakdown
         }
     
-    def _build_timeline_model(self, ast) -> Dict[str, Any]:
+    def _build_timeline_model(self, ast, cost_avoidance: Dict[str, Any]) -> Dict[str, Any]:
         """Build timeline/delay cost model"""
-        # Get timeline risk from metrics
-        timeline_risk = 0.0
-        for metric in ast.metrics:
-            if 'timeline' in metric.name.lower() or 'delay' in metric.name.lower():
-                timeline_risk = metric.value
-                break
+        # Get timeline risk from the first timeline/delay metric
+        timeline_risk = next(
+            (m.value for m in ast.metrics
+             if 'timeline' in (name_lower := m.name.lower()) or 'delay' in name_lower),
+            0.0
+        )
         
-        cost_avoidance = self._calculate_cost_avoidance(ast)
         monthly_burn = cost_avoidance.get('total_monthly_burn', 0)
         
         return {
@@ -121,7 +157,7 @@ class vROITranspiler:
             "expected_value_of_action": monthly_burn * timeline_risk
         }
     
-    def _define_inputs(self, ast) -> List[Dict[str, Any]]:
+    def _define_inputs(self, ast, parsed_goals: List[_ParsedGoal]) -> List[Dict[str, Any]]:
         """Define calculator input fields"""
         inputs = []
         
@@ -139,13 +175,15 @@ class vROITranspiler:
             })
         
         # Add goal-based inputs
-        for goal in ast.goals:
+        for parsed in parsed_goals:
+            goal = parsed.goal
             if '$' in goal.value:
                 inputs.append({
                     "field_id": f"{goal.name}_Value",
                     "label": f"{self._format_label(goal.name)} Amount",
                     "type": "currency",
-                    "default": self._extract_default_value(goal.value),
+                    # First dollar figure in the goal
+                    "default": parsed.amounts[0] if parsed.amounts else 0,
                     "description": goal.value
                 })
         
@@ -178,35 +216,19 @@ class vROITranspiler:
             ],
             "visualization": {
                 "chart_type": "waterfall",
-                "show_scenarios": true,
+                "show_scenarios": True,
                 "timeline_months": 12
             }
         }
     
-    def _categorize_value(self, goal_text: str) -> str:
-        """Categorize value type"""
-        goal_lower = goal_text.lower()
-        
-        if any(word in goal_lower for word in ['avoid', 'prevent', 'reduce']):
-            return "cost_avoidance"
-        elif any(word in goal_lower for word in ['increase', 'improve', 'gain']):
-            return "value_gain"
-        elif any(word in goal_lower for word in ['restore', 'regain', 'recover']):
-            return "recovery"
-        else:
-            return "optimization"
+    def _categorize_value(self, goal_lower: str) -> str:
+        """Categorize value type from the lowercased goal text"""
+        for category, pattern in _VALUE_CATEGORY_PATTERNS:
+            if pattern.search(goal_lower):
+                return category
+        return "optimization"
     
     def _format_label(self, name: str) -> str:
         """Format camelCase to Display Label"""
-        import re
-        spaced = re.sub(r'([A-Z])', r' \1', name)
+        spaced = _CAMEL_RE.sub(' ', name)
         return spaced.strip()
-    
-    def _extract_default_value(self, goal_text: str) -> float:
-        """Extract default dollar value from goal"""
-        matches = re.findall(r'\$(\d+\.?\d*)\s*([MK])', goal_text)
-        if matches:
-            amount = float(matches[0][0])
-            multiplier = 1_000_000 if matches[0][1] == 'M' else 1_000
-            return amount * multiplier
-        return 0
@@ -3,23 +3,53 @@ ROI-DSL Validator v2.1
 Validates semantic rules and business logic guardrails
 """
 
-from typing import Dict, List
+from typing import Dict, List, Set
 import re
 
 
+# Characters that mark a GOAL value as quantified
+_QUANT_CHARS = ('$', '%', 'M', 'K')
+
+# Operator/function words allowed in RMetric expressions
+_EXPR_KEYWORDS = frozenset({'AND', 'OR', 'NOT', 'IF'})
+
+# Comparators a trigger condition may use
+_VALID_COMPARATORS = frozenset({'>', '<', '>=', '<=', '==', '!='})
+
+# Recognised OUTPUT declarations
+_VALID_OUTPUTS = frozenset({'SMS_CAMPAIGN', 'AGENT', 'RMetrics', 'vROI', 'MintSite', 'SK_SKILL'})
+
+# Capitalized identifiers referenced by an RMetric expression
+_IDENT_RE = re.compile(r'\b[A-Z]\w+\b')
+
+# "<metric> <op> <number>" trigger conditions
+_CONDITION_RE = re.compile(r'(\w+)\s*([><=!]+)\s*([\d.]+)')
+
+# "action(arg)" / "action('arg')" trigger actions
+_ACTION_RE = re.compile(r'(\w+)\(["\']?\w+["\']?\)')
+
+
 class ROIValidator:
     """Validates ROI-DSL AST for semantic correctness"""
     
-    def __init__(self, ast):
+    def __init__(self, ast) -> None:
         self.ast = ast
-        self.errors = []
-        self.warnings = []
+        self.errors: List[str] = []
+        self.warnings: List[str] = []
+        # Identifier tokens of each RMetric expression, aligned with ast.rmetrics
+        self._rmetric_tokens: List[List[str]] = []
+        # Declared METRIC names, shared by the reference checks
+        self._metric_names: Set[str] = set()
     
     def validate(self) -> Dict[str, List[str]]:
         """
         Run all validation checks
         Returns: {'errors': [...], 'warnings': [...]}
         """
+        # Both RMetric checks read the same tokens; scan each expression once
+        self._rmetric_tokens = [_IDENT_RE.findall(r.expr) for r in self.ast.rmetrics]
+        self._metric_names = {m.name for m in self.ast.metrics}
+        
         self._validate_mandatory_fields()
         self._validate_persona()
         self._validate_goals()
@@ -60,82 +90,89 @@ class ROIValidator:
     
     def _validate_goals(self):
         """Validate GOAL blocks"""
+        add_error = self.errors.append
+        add_warning = self.warnings.append
         goal_names = set()
         
         for goal in self.ast.goals:
             # Check for duplicates
             if goal.name in goal_names:
-                self.errors.append(f"Duplicate GOAL name: {goal.name}")
+                add_error(f"Duplicate GOAL name: {goal.name}")
             goal_names.add(goal.name)
             
             # Check naming convention
             if not goal.name[0].isupper():
-                self.warnings.append(f"GOAL name '{goal.name}' should start with uppercase (PascalCase)")
+                add_warning(f"GOAL name '{goal.name}' should start with uppercase (PascalCase)")
             
             # Check value
             if not goal.value:
-                self.errors.append(f"GOAL {goal.name} has empty value")
+                add_error(f"GOAL {goal.name} has empty value")
             
             # Recommend quantifiable goals
-            if not any(char in goal.value for char in ['$', '%', 'M', 'K']):
-                self.warnings.append(f"GOAL {goal.name} lacks quantifiable metric - consider adding dollar/percentage value")
+            if not any(char in goal.value for char in _QUANT_CHARS):
+                add_warning(f"GOAL {goal.name} lacks quantifiable metric - consider adding dollar/percentage value")
     
     def _validate_metrics(self):
         """Validate METRIC blocks"""
+        add_error = self.errors.append
+        add_warning = self.warnings.append
         metric_names = set()
         
         for metric in self.ast.metrics:
             # Check for duplicates
             if metric.name in metric_names:
-                self.errors.append(f"Duplicate METRIC name: {metric.name}")
+                add_error(f"Duplicate METRIC name: {metric.name}")
             metric_names.add(metric.name)
             
             # Check naming convention
             if not metric.name[0].isupper():
-                self.warnings.append(f"METRIC name '{metric.name}' should start with uppercase (PascalCase)")
+                add_warning(f"METRIC name '{metric.name}' should start with uppercase (PascalCase)")
             
             # Check value range
             if metric.value < 0:
-                self.warnings.append(f"METRIC {metric.name} has negative value: {metric.value}")
+                add_warning(f"METRIC {metric.name} has negative value: {metric.value}")
             
             if metric.value > 1.0 and 'Risk' in metric.name:
-                self.warnings.append(f"METRIC {metric.name} appears to be a risk/drift metric but value > 1.0")
+                add_warning(f"METRIC {metric.name} appears to be a risk/drift metric but value > 1.0")
     
     def _validate_rmetrics(self):
         """Validate RMetric blocks"""
+        add_error = self.errors.append
+        add_warning = self.warnings.append
         rmetric_names = set()
-        metric_names = {m.name for m in self.ast.metrics}
+        metric_names = self._metric_names
         
-        for rmetric in self.ast.rmetrics:
+        for rmetric, expr_tokens in zip(self.ast.rmetrics, self._rmetric_tokens):
             # Check for duplicates
             if rmetric.name in rmetric_names:
-                self.errors.append(f"Duplicate RMetric name: {rmetric.name}")
+                add_error(f"Duplicate RMetric name: {rmetric.name}")
             rmetric_names.add(rmetric.name)
             
             # Check naming convention
             if not rmetric.name[0].isupper():
-                self.warnings.append(f"RMetric name '{rmetric.name}' should start with uppercase (PascalCase)")
+                add_warning(f"RMetric name '{rmetric.name}' should start with uppercase (PascalCase)")
             
             # Validate expression references valid metrics
-            expr_tokens = re.findall(r'\b[A-Z]\w+\b', rmetric.expr)
             for token in expr_tokens:
                 if token not in metric_names and token not in rmetric_names:
-                    self.errors.append(f"RMetric {rmetric.name} references undefined METRIC: {token}")
+                    add_error(f"RMetric {rmetric.name} references undefined METRIC: {token}")
             
             # Check for circular references (basic check)
             if rmetric.name in rmetric.expr:
-                self.errors.append(f"RMetric {rmetric.name} contains circular reference to itself")
+                add_error(f"RMetric {rmetric.name} contains circular reference to itself")
     
     def _validate_triggers(self):
         """Validate WHEN/THEN trigger blocks"""
-        metric_names = {m.name for m in self.ast.metrics}
+        add_error = self.errors.append
+        add_warning = self.warnings.append
+        metric_names = self._metric_names
         
         for trigger in self.ast.triggers:
             # Extract metric name from condition
-            condition_match = re.match(r'(\w+)\s*([><=!]+)\s*([\d.]+)', trigger.condition)
+            condition_match = _CONDITION_RE.match(trigger.condition)
             
             if not condition_match:
-                self.errors.append(f"Invalid trigger condition syntax: {trigger.condition}")
+                add_error(f"Invalid trigger condition syntax: {trigger.condition}")
                 continue
             
             metric_name = condition_match.group(1)
@@ -144,34 +181,33 @@ class ROIValidator:
             
             # Validate metric exists
             if metric_name not in metric_names:
-                self.errors.append(f"Trigger references undefined METRIC: {metric_name}")
+                add_error(f"Trigger references undefined METRIC: {metric_name}")
             
             # Validate comparator
-            valid_comparators = ['>', '<', '>=', '<=', '==', '!=']
-            if comparator not in valid_comparators:
-                self.errors.append(f"Invalid comparator '{comparator}' in trigger")
+            if comparator not in _VALID_COMPARATORS:
+                add_error(f"Invalid comparator '{comparator}' in trigger")
             
             # Validate action format
-            action_match = re.match(r'(\w+)\(["\']?\w+["\']?\)', trigger.action)
+            action_match = _ACTION_RE.match(trigger.action)
             if not action_match:
-                self.warnings.append(f"Action '{trigger.action}' may have invalid syntax")
+                add_warning(f"Action '{trigger.action}' may have invalid syntax")
     
     def _validate_variants(self):
         """Validate VARIANT blocks"""
+        add_error = self.errors.append
+        
         # Allow multiple variants - they can be used for different page types/contexts
         for variant in self.ast.variants:
             # Check value
             if not variant.value:
-                self.errors.append(f"VARIANT {variant.type} has empty value")
+                add_error(f"VARIANT {variant.type} has empty value")
     
     def _validate_output(self):
         """Validate OUTPUT block"""
         if not self.ast.output:
             return
         
-        valid_outputs = ['SMS_CAMPAIGN', 'AGENT', 'RMetrics', 'vROI', 'MintSite', 'SK_SKILL']
-        
-        if self.ast.output not in valid_outputs:
+        if self.ast.output not in _VALID_OUTPUTS:
             self.errors.append(f"Invalid OUTPUT type: {self.ast.output}")
         
         # Warn about output-specific requirements
@@ -192,17 +228,16 @@ class ROIValidator:
     
     def _validate_identifier_references(self):
         """Check all identifiers are properly declared before use"""
-        metric_names = {m.name for m in self.ast.metrics}
-        goal_names = {g.name for g in self.ast.goals}
+        add_warning = self.warnings.append
+        metric_names = self._metric_names
         
         # Check RMetrics only reference declared metrics
-        for rmetric in self.ast.rmetrics:
-            tokens = re.findall(r'\b[A-Z]\w+\b', rmetric.expr)
+        for rmetric, tokens in zip(self.ast.rmetrics, self._rmetric_tokens):
             for token in tokens:
                 if token not in metric_names:
                     # Allow some common operators/functions
-                    if token not in ['AND', 'OR', 'NOT', 'IF']:
-                        self.warnings.append(f"RMetric {rmetric.name} references '{token}' which is not a declared METRIC")
+                    if token not in _EXPR_KEYWORDS:
+                        add_warning(f"RMetric {rmetric.name} references '{token}' which is not a declared METRIC")
     
     def is_valid(self) -> bool:
         """Returns True if no errors (warnings are OK)"""
@@ -4,25 +4,41 @@ ROI-DSL Compiler - Usage Examples
 Demonstrates all CLI capabilities
 """
 
-import subprocess
 import os
+import sys
+import traceback
+from itertools import islice
 from pathlib import Path
 
+from roi_compile import main as roi_main
+
+# Examples and outputs live next to this script
+BASE_DIR = Path(__file__).resolve().parent
+
 def print_section(title):
     print("\n" + "="*70)
     print(f"  {title}")
     print("="*70 + "\n")
 
-def run_cmd(cmd_list):
-    """Run command and show output"""
-    print(f"$ {' '.join(cmd_list)}\n")
-    result = subprocess.run(cmd_list, capture_output=True, text=True, cwd="/home/claude/roi_dsl_cli")
-    print(result.stdout)
-    if result.stderr:
-        print("STDERR:", result.stderr)
-    return result.returncode == 0
+def run_cmd(args):
+    """Run a roi_compile command in this process and show its output"""
+    print(f"$ python3 roi_compile.py {' '.join(args)}\n")
+    # The CLI exits with its status; run it in-process instead of paying
+    # interpreter startup and compiler imports for every example
+    try:
+        roi_main(args)
+        returncode = 0
+    except SystemExit as e:
+        returncode = e.code or 0
+    except Exception:
+        print("STDERR:", traceback.format_exc())
+        returncode = 1
+    print()
+    return returncode == 0
 
 def main():
+    os.chdir(BASE_DIR)
+    
     print("""
 ╔═══════════════════════════════════════════════════════════════════════╗
 ║                                                                       ║
@@ -35,31 +51,31 @@ def main():
 
     # Example 1: Validation
     print_section("EXAMPLE 1: Validate ROI-DSL Syntax")
-    run_cmd(["python3", "roi_compile.py", "validate", "examples/clinical_trial_sponsor.roi"])
+    run_cmd(["validate", "examples/clinical_trial_sponsor.roi"])
 
     # Example 2: Preview
     print_section("EXAMPLE 2: Preview Compilation Outputs")
-    run_cmd(["python3", "roi_compile.py", "preview", "examples/clinical_trial_sponsor.roi"])
+    run_cmd(["preview", "examples/clinical_trial_sponsor.roi"])
 
     # Example 3: Full Compilation
     print_section("EXAMPLE 3: Full Compilation")
-    run_cmd(["python3", "roi_compile.py", "compile", "examples/clinical_trial_sponsor.roi"])
+    run_cmd(["compile", "examples/clinical_trial_sponsor.roi"])
 
     # Example 4: Verbose Compilation
     print_section("EXAMPLE 4: Verbose Compilation (Detailed Output)")
-    run_cmd(["python3", "roi_compile.py", "compile", "examples/clinical_trial_sponsor.roi", "--verbose"])
+    run_cmd(["compile", "examples/clinical_trial_sponsor.roi", "--verbose"])
 
     # Example 5: Dry Run
     print_section("EXAMPLE 5: Dry Run (Validate Without Generating Files)")
-    run_cmd(["python3", "roi_compile.py", "compile", "examples/clinical_trial_sponsor.roi", "--dry-run"])
+    run_cmd(["compile", "examples/clinical_trial_sponsor.roi", "--dry-run"])
 
     # Example 6: Specific Output
     print_section("EXAMPLE 6: Generate Only MintSite")
-    run_cmd(["python3", "roi_compile.py", "compile", "examples/clinical_trial_sponsor.roi", "--output", "mintsite"])
+    run_cmd(["compile", "examples/clinical_trial_sponsor.roi", "--output", "mintsite"])
 
     # Show generated files
     print_section("GENERATED OUTPUT FILES")
-    outputs_dir = Path("/home/claude/roi_dsl_cli/outputs")
+    outputs_dir = BASE_DIR / "outputs"
     
     for subdir in outputs_dir.iterdir():
         if subdir.is_dir():
@@ -73,10 +89,9 @@ def main():
     print_section("SAMPLE: MintSite Configuration (first 20 lines)")
     mintsite_file = outputs_dir / "mintsite" / "site_config.json"
     if mintsite_file.exists():
-        with open(mintsite_file, 'r') as f:
-            lines = f.readlines()[:20]
-            for line in lines:
-                print(line, end='')
+        with open(mintsite_file, 'r', encoding='utf-8') as f:
+            # Only the first 20 lines are read, however large the config
+            sys.stdout.writelines(islice(f, 20))
         print("\n  ... (truncated)")
 
     # Final message
@@ -14,10 +14,58 @@ Usage:
 import sys
 import os
 import argparse
+import contextlib
+import functools
+import importlib
+import queue
 import time
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
 import json
+import traceback
+
+from compiler._ast_cache import ASTCache
+from compiler._hash import digest
+from compiler._json import dumps_bytes
+
+# Watch mode recompiles once no change has arrived for this long, so a burst
+# of events from a single save triggers one build
+_WATCH_DEBOUNCE_SECONDS = 0.3
+
+# watchdog event types that can change the watched file's content
+_WATCH_EVENT_TYPES = frozenset({'modified', 'created', 'moved'})
+
+# Output type -> (module, class, subdir, file written under outputs/);
+# modules are imported on first use. Cloudflare writes a whole directory.
+_TRANSPILERS = {
+    'sdr': ('compiler.transpiler_sdr_automation', 'SDRAutomationTranspiler', 'sdr', 'sdr_automation_config.json'),
+    'cloudflare': ('compiler.transpiler_cloudflare', 'CloudflarePagesTranspiler', 'cloudflare', None),
+    'mintsite': ('compiler.transpiler_mintsite', 'MintSiteTranspiler', 'mintsite', 'site_config.json'),
+    'skills': ('compiler.transpiler_sk_skill', 'SKSkillTranspiler', 'skills', 'semantic_skill.txt'),
+    'campaigns': ('compiler.transpiler_campaign', 'SMSCampaignTranspiler', 'campaigns', 'sms_campaign.json'),
+    'agents': ('compiler.transpiler_agent', 'AgentTranspiler', 'agents', 'ai_agent_config.json'),
+    'rmetrics': ('compiler.transpiler_rmetrics', 'RMetricsTranspiler', 'rmetrics', 'metrics_config.json'),
+    'rmetrics-msgpack': ('compiler.transpiler_rmetrics', 'RMetricsTranspiler', 'rmetrics', 'metrics_config.msgpack'),
+    'vroi': ('compiler.transpiler_vroi', 'vROITranspiler', 'vroi', 'vroi_calculator.json'),
+}
+
+# OUTPUT declaration -> output types generated when --output is not given
+_OUTPUTS_BY_AST_OUTPUT = {
+    'SMS_CAMPAIGN': ('campaigns',),
+    'AGENT': ('agents',),
+    'RMetrics': ('rmetrics',),
+    'vROI': ('vroi',),
+    'MintSite': ('mintsite', 'agents', 'campaigns'),  # MintSite generates multiple
+    'SK_SKILL': ('skills',),
+}
+_DEFAULT_OUTPUTS = ('mintsite',)
+
+# Outputs written from compile() even though their transpiler offers
+# compile_dict(): compile() returns its cached text for a known definition
+_CACHED_TEXT_OUTPUTS = frozenset({'rmetrics'})
+
+# Outputs written from transpiler.compile_binary(ast); only on request
+_BINARY_OUTPUTS = frozenset({'rmetrics-msgpack'})
 
 # Color codes for terminal output
 class Colors:
@@ -31,31 +79,134 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
-def print_header(text: str):
-    """Print a formatted header"""
-    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*60}{Colors.ENDC}")
-    print(f"{Colors.HEADER}{Colors.BOLD}{text:^60}{Colors.ENDC}")
-    print(f"{Colors.HEADER}{Colors.BOLD}{'='*60}{Colors.ENDC}\n")
+# Escape codes only reach a terminal; piped output and NO_COLOR get plain text
+_USE_COLOR = (sys.stdout is not None and sys.stdout.isatty()
+              and not os.environ.get('NO_COLOR'))
+if not _USE_COLOR:
+    for _name in [n for n in vars(Colors) if n.isupper()]:
+        setattr(Colors, _name, '')
+
+_HEADER_STYLE = Colors.HEADER + Colors.BOLD
+_HEADER_BAR = f"{_HEADER_STYLE}{'='*60}{Colors.ENDC}"
+
+class ConsoleBuffer:
+    """Collect console lines and write them to stdout in one call per flush"""
+    
+    def __init__(self):
+        self._lines = []
+    
+    def line(self, text: str = ""):
+        """Queue a plain line"""
+        self._lines.append(text)
+    
+    def header(self, text: str):
+        """Queue a formatted header"""
+        self._lines.append(f"\n{_HEADER_BAR}")
+        self._lines.append(f"{_HEADER_STYLE}{text:^60}{Colors.ENDC}")
+        self._lines.append(f"{_HEADER_BAR}\n")
+    
+    def success(self, text: str):
+        """Queue success message"""
+        self._lines.append(f"{Colors.OKGREEN}✓ {text}{Colors.ENDC}")
+    
+    def error(self, text: str):
+        """Queue error message"""
+        self._lines.append(f"{Colors.FAIL}✗ {text}{Colors.ENDC}")
+    
+    def warning(self, text: str):
+        """Queue warning message"""
+        self._lines.append(f"{Colors.WARNING}⚠ {text}{Colors.ENDC}")
+    
+    def info(self, text: str):
+        """Queue info message"""
+        self._lines.append(f"{Colors.OKCYAN}ℹ {text}{Colors.ENDC}")
+    
+    def step(self, step: int, total: int, text: str):
+        """Queue compilation step"""
+        self._lines.append(f"{Colors.OKBLUE}[{step}/{total}]{Colors.ENDC} {text}")
+    
+    def flush(self):
+        """Write queued lines to the current sys.stdout"""
+        if self._lines:
+            text = "\n".join(self._lines)
+            self._lines.clear()
+            sys.stdout.write(text + "\n")
+            sys.stdout.flush()
+
+
+console = ConsoleBuffer()
+
+# Print helpers queue on the shared console; output appears at the next flush
+print_header = console.header
+print_success = console.success
+print_error = console.error
+print_warning = console.warning
+print_info = console.info
+print_step = console.step
+
 
-def print_success(text: str):
-    """Print success message"""
-    print(f"{Colors.OKGREEN}✓ {text}{Colors.ENDC}")
+def _flushes_console(method):
+    """Flush the console however method returns"""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        try:
+            return method(*args, **kwargs)
+        finally:
+            console.flush()
+    return wrapper
+
+
+def _read_source(input_file: str) -> Tuple[str, str]:
+    """Text of a .roi file and the digest of its bytes, from a single read"""
+    data = Path(input_file).read_bytes()
+    roi_content = data.decode('utf-8')
+    if '\r' in roi_content:
+        # Same newline handling as reading in text mode
+        roi_content = roi_content.replace('\r\n', '\n').replace('\r', '\n')
+    return roi_content, digest(data)
+
+
+@contextlib.contextmanager
+def _atomic_open(path: Path, mode: str = 'w'):
+    """File that replaces path only once it has been written completely"""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, mode, encoding=None if 'b' in mode else 'utf-8') as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
 
-def print_error(text: str):
-    """Print error message"""
-    print(f"{Colors.FAIL}✗ {text}{Colors.ENDC}")
 
-def print_warning(text: str):
-    """Print warning message"""
-    print(f"{Colors.WARNING}⚠ {text}{Colors.ENDC}")
+def _atomic_write(path: Path, content):
+    """Atomically replace path with content (text or bytes)"""
+    with _atomic_open(path, 'wb' if isinstance(content, bytes) else 'w') as f:
+        f.write(content)
 
-def print_info(text: str):
-    """Print info message"""
-    print(f"{Colors.OKCYAN}ℹ {text}{Colors.ENDC}")
 
-def print_step(step: int, total: int, text: str):
-    """Print compilation step"""
-    print(f"{Colors.OKBLUE}[{step}/{total}]{Colors.ENDC} {text}")
+def _write_dict(transpiler, output_file: Path, result: str, ast):
+    """Serialize transpiler.compile_dict(ast) once, straight to UTF-8 bytes"""
+    output_file.parent.mkdir(exist_ok=True)
+    _atomic_write(output_file, dumps_bytes(transpiler.compile_dict(ast)))
+    return result, [output_file]
+
+
+def _write_binary(transpiler, output_file: Path, result: str, ast):
+    """Write the bytes transpiler.compile_binary(ast) returns"""
+    output_file.parent.mkdir(exist_ok=True)
+    _atomic_write(output_file, transpiler.compile_binary(ast))
+    return result, [output_file]
+
+
+def _write_compiled(transpiler, output_file: Path, result: str, ast):
+    """Write the text or bytes transpiler.compile(ast) returns"""
+    output_file.parent.mkdir(exist_ok=True)
+    _atomic_write(output_file, transpiler.compile(ast))
+    return result, [output_file]
 
 
 class ROICompilerCLI:
@@ -67,6 +218,22 @@ class ROICompilerCLI:
         self.output_dir = self.base_dir / "outputs"
         self.examples_dir = self.base_dir / "examples"
         
+        # Parsed ASTs, with their validation and analysis, are reused across
+        # runs and commands for unchanged source
+        self.ast_cache = ASTCache()
+        
+        # One instance per output type, created on first use, so their
+        # output caches survive between watch-mode recompiles
+        self._transpilers = {}
+        
+        # output type -> writer(ast) with its transpiler, write strategy and
+        # path already resolved, so repeat builds skip the dispatch
+        self._writers = {}
+        
+        # output type -> (source digest, result, {path: digest}) of its last
+        # build, so an unchanged source is not transpiled or written again
+        self._last_outputs = {}
+        
         # Ensure output directories exist
         self._setup_directories()
     
@@ -83,6 +250,7 @@ class ROICompilerCLI:
         for d in dirs:
             d.mkdir(parents=True, exist_ok=True)
     
+    @_flushes_console
     def compile_file(self, input_file: str, output_types: Optional[List[str]] = None, 
                     verbose: bool = False, dry_run: bool = False):
         """
@@ -107,21 +275,21 @@ class ROICompilerCLI:
             print_warning("Input file should have .roi extension")
         
         try:
-            with open(input_file, 'r') as f:
-                roi_content = f.read()
+            # The digest identifies the content for the AST cache and the output memo
+            roi_content, source_digest = _read_source(input_file)
         except Exception as e:
             print_error(f"Failed to read input file: {e}")
             return False
         
         print_success(f"Loaded {len(roi_content)} characters from {input_file}")
         
+        console.flush()
+        
         # Step 2: Parse ROI-DSL
         print_step(2, 5, "Parsing ROI-DSL syntax...")
         
         try:
-            from compiler.parser import ROIDSLParser
-            parser = ROIDSLParser(roi_content)
-            ast = parser.parse()
+            ast = self.ast_cache.parse(roi_content, source_digest)
             
             if verbose:
                 print_info(f"  Found {len(ast.goals)} GOALs")
@@ -135,17 +303,16 @@ class ROICompilerCLI:
         except Exception as e:
             print_error(f"Parse failed: {e}")
             if verbose:
-                import traceback
-                print(traceback.format_exc())
+                console.line(traceback.format_exc())
             return False
         
+        console.flush()
+        
         # Step 3: Validate semantic rules
         print_step(3, 5, "Validating semantic rules...")
         
         try:
-            from compiler.validator import ROIValidator
-            validator = ROIValidator(ast)
-            validation_result = validator.validate()
+            validation_result = self.ast_cache.validate(ast, source_digest)
             
             if validation_result.get('errors'):
                 for error in validation_result['errors']:
@@ -166,13 +333,13 @@ class ROICompilerCLI:
             print_info("Dry run - skipping output generation")
             return True
         
+        console.flush()
+        
         # Step 4: Interpret and analyze
         print_step(4, 5, "Analyzing value framework...")
         
         try:
-            from compiler.interpreter import ROIInterpreter
-            interpreter = ROIInterpreter(ast)
-            analysis = interpreter.analyze()
+            analysis = self.ast_cache.analyze(ast, source_digest)
             
             if verbose:
                 print_info(f"  Persona: {analysis.get('persona', 'N/A')}")
@@ -185,6 +352,8 @@ class ROICompilerCLI:
             print_warning(f"Analysis skipped: {e}")
             analysis = {}
         
+        console.flush()
+        
         # Step 5: Transpile to outputs
         print_step(5, 5, "Generating downstream assets...")
         
@@ -195,142 +364,110 @@ class ROICompilerCLI:
         
         for output_type in requested_outputs:
             try:
-                result = self._transpile_output(ast, output_type, verbose)
+                result = self._transpile_output(ast, output_type, verbose, source_digest)
                 if result:
                     outputs_generated.append(result)
                     print_success(f"  Generated: {result}")
             except Exception as e:
                 print_error(f"  Failed to generate {output_type}: {e}")
                 if verbose:
-                    import traceback
-                    print(traceback.format_exc())
+                    console.line(traceback.format_exc())
+        
+        console.flush()
         
         # Summary
         print_header("Compilation Summary")
         print_success(f"Successfully generated {len(outputs_generated)} output(s)")
+        if verbose:
+            print_info(f"AST cache: {self.ast_cache.hits} hit(s), {self.ast_cache.misses} miss(es)")
         
         for output in outputs_generated:
-            print(f"  📄 {output}")
+            console.line(f"  📄 {output}")
         
-        print(f"\n{Colors.BOLD}Output directory:{Colors.ENDC} {self.output_dir}\n")
+        console.line(f"\n{Colors.BOLD}Output directory:{Colors.ENDC} {self.output_dir}\n")
         
         return True
     
-    def _get_outputs_from_ast(self, ast) -> List[str]:
+    def _get_outputs_from_ast(self, ast) -> Tuple[str, ...]:
         """Determine which outputs to generate based on AST"""
-        output_map = {
-            'SMS_CAMPAIGN': ['campaigns'],
-            'AGENT': ['agents'],
-            'RMetrics': ['rmetrics'],
-            'vROI': ['vroi'],
-            'MintSite': ['mintsite', 'agents', 'campaigns'],  # MintSite generates multiple
-            'SK_SKILL': ['skills']
-        }
-        
-        return output_map.get(ast.output, ['mintsite'])
-    
-    def _transpile_output(self, ast, output_type: str, verbose: bool) -> Optional[str]:
+        return _OUTPUTS_BY_AST_OUTPUT.get(ast.output, _DEFAULT_OUTPUTS)
+    
+    def _transpile_output(self, ast, output_type: str, verbose: bool,
+                          source_digest: Optional[str] = None) -> Optional[str]:
         """Transpile AST to specific output type"""
-        
-        if output_type == 'sdr':
-            from compiler.transpiler_sdr_automation import SDRAutomationTranspiler
-            transpiler = SDRAutomationTranspiler()
-            output_json = transpiler.compile(ast)
-            
-            sdr_dir = self.output_dir / "sdr"
-            sdr_dir.mkdir(exist_ok=True)
-            output_file = sdr_dir / "sdr_automation_config.json"
-            with open(output_file, 'w') as f:
-                f.write(output_json)
-            
-            return str(output_file.relative_to(self.base_dir))
-        
-        elif output_type == 'cloudflare':
-            from compiler.transpiler_cloudflare import CloudflarePagesTranspiler
-            transpiler = CloudflarePagesTranspiler()
-            files = transpiler.compile(ast)
-            
-            # Write all files
-            cloudflare_dir = self.output_dir / "cloudflare"
-            cloudflare_dir.mkdir(exist_ok=True)
-            (cloudflare_dir / "functions").mkdir(exist_ok=True)
-            
-            for filename, content in files.items():
-                filepath = cloudflare_dir / filename
-                filepath.parent.mkdir(parents=True, exist_ok=True)
-                with open(filepath, 'w') as f:
-                    f.write(content)
-            
-            return str(cloudflare_dir.relative_to(self.base_dir))
-        
-        elif output_type == 'mintsite':
-            from compiler.transpiler_mintsite import MintSiteTranspiler
-            transpiler = MintSiteTranspiler()
-            result = transpiler.compile(ast)
-            
-            output_file = self.output_dir / "mintsite" / "site_config.json"
-            with open(output_file, 'w') as f:
-                f.write(result)
-            
-            return str(output_file.relative_to(self.base_dir))
-        
-        elif output_type == 'skills':
-            from compiler.transpiler_sk_skill import SKSkillTranspiler
-            transpiler = SKSkillTranspiler()
-            result = transpiler.compile(ast)
-            
-            output_file = self.output_dir / "skills" / "semantic_skill.txt"
-            with open(output_file, 'w') as f:
-                f.write(result)
-            
-            return str(output_file.relative_to(self.base_dir))
-        
-        elif output_type == 'campaigns':
-            from compiler.transpiler_campaign import SMSCampaignTranspiler
-            transpiler = SMSCampaignTranspiler()
-            result = transpiler.compile(ast)
-            
-            output_file = self.output_dir / "campaigns" / "sms_campaign.json"
-            with open(output_file, 'w') as f:
-                f.write(result)
-            
-            return str(output_file.relative_to(self.base_dir))
-        
-        elif output_type == 'agents':
-            from compiler.transpiler_agent import AgentTranspiler
-            transpiler = AgentTranspiler()
-            result = transpiler.compile(ast)
-            
-            output_file = self.output_dir / "agents" / "ai_agent_config.json"
-            with open(output_file, 'w') as f:
-                f.write(result)
-            
-            return str(output_file.relative_to(self.base_dir))
-        
-        elif output_type == 'rmetrics':
-            from compiler.transpiler_rmetrics import RMetricsTranspiler
-            transpiler = RMetricsTranspiler()
-            result = transpiler.compile(ast)
-            
-            output_file = self.output_dir / "rmetrics" / "metrics_config.json"
-            with open(output_file, 'w') as f:
-                f.write(result)
-            
-            return str(output_file.relative_to(self.base_dir))
-        
-        elif output_type == 'vroi':
-            from compiler.transpiler_vroi import vROITranspiler
-            transpiler = vROITranspiler()
-            result = transpiler.compile(ast)
-            
-            output_file = self.output_dir / "vroi" / "vroi_calculator.json"
-            with open(output_file, 'w') as f:
-                f.write(result)
-            
-            return str(output_file.relative_to(self.base_dir))
-        
-        return None
+        last = self._last_outputs.get(output_type)
+        if (source_digest is not None and last is not None and last[0] == source_digest
+                and all(self._file_digest(path) == digest for path, digest in last[2].items())):
+            # Same source as the last build and its files are untouched
+            return last[1]
+        
+        written = self._write_output(ast, output_type)
+        if written is None:
+            return None
+        
+        result, paths = written
+        digests = {path: self._file_digest(path) for path in paths}
+        self._last_outputs[output_type] = (source_digest, result, digests)
+        return result
     
+    def _write_output(self, ast, output_type: str):
+        """Write one output type; returns (result, paths written) or None"""
+        writer = self._writers.get(output_type)
+        if writer is None:
+            if output_type not in _TRANSPILERS:
+                return None
+            writer = self._writers.setdefault(output_type, self._plan_writer(output_type))
+        return writer(ast)
+    
+    def _plan_writer(self, output_type: str):
+        """Bind output_type's transpiler and output file to the writer it needs"""
+        transpiler = self._get_transpiler(output_type)
+        if output_type == 'cloudflare':
+            return functools.partial(self._write_cloudflare, transpiler)
+        
+        _, _, subdir, filename = _TRANSPILERS[output_type]
+        output_file = self.output_dir / subdir / filename
+        result = str(output_file.relative_to(self.base_dir))
+        
+        if output_type in _BINARY_OUTPUTS:
+            write = _write_binary
+        elif hasattr(transpiler, 'compile_dict') and output_type not in _CACHED_TEXT_OUTPUTS:
+            write = _write_dict
+        else:
+            write = _write_compiled
+        return functools.partial(write, transpiler, output_file, result)
+    
+    def _write_cloudflare(self, transpiler, ast):
+        """Write the Cloudflare Pages site: index.html plus its assets"""
+        # Write all files
+        cloudflare_dir = self.output_dir / "cloudflare"
+        cloudflare_dir.mkdir(exist_ok=True)
+        (cloudflare_dir / "functions").mkdir(exist_ok=True)
+        
+        # Stream the page straight to disk rather than building it first
+        paths = [cloudflare_dir / "index.html"]
+        with _atomic_open(paths[0]) as f:
+            transpiler.write_html(ast, f)
+        
+        for filename, content in transpiler.compile_assets(ast).items():
+            filepath = cloudflare_dir / filename
+            filepath.parent.mkdir(parents=True, exist_ok=True)
+            _atomic_write(filepath, content)
+            paths.append(filepath)
+        
+        return str(cloudflare_dir.relative_to(self.base_dir)), paths
+    
+    def _get_transpiler(self, output_type: str):
+        """Transpiler for output_type, shared across compiles"""
+        transpiler = self._transpilers.get(output_type)
+        if transpiler is None:
+            # A module missing from this checkout only fails its own output
+            module_name, class_name = _TRANSPILERS[output_type][:2]
+            transpiler_class = getattr(importlib.import_module(module_name), class_name)
+            transpiler = self._transpilers.setdefault(output_type, transpiler_class())
+        return transpiler
+    
+    @_flushes_console
     def validate_file(self, input_file: str, verbose: bool = False):
         """Validate a .roi file without compiling"""
         print_header("ROI-DSL Validator")
@@ -340,53 +477,47 @@ class ROICompilerCLI:
             return False
         
         try:
-            with open(input_file, 'r') as f:
-                roi_content = f.read()
-            
-            from compiler.parser import ROIDSLParser
-            from compiler.validator import ROIValidator
+            roi_content, source_digest = _read_source(input_file)
             
             # Parse
             print_info("Parsing...")
-            parser = ROIDSLParser(roi_content)
-            ast = parser.parse()
+            ast = self.ast_cache.parse(roi_content, source_digest)
             print_success("Parse successful")
             
             # Validate
             print_info("Validating...")
-            validator = ROIValidator(ast)
-            result = validator.validate()
+            result = self.ast_cache.validate(ast, source_digest)
             
             if result.get('errors'):
                 print_error(f"Found {len(result['errors'])} error(s):")
                 for error in result['errors']:
-                    print(f"  • {error}")
+                    console.line(f"  • {error}")
                 return False
             
             if result.get('warnings'):
                 print_warning(f"Found {len(result['warnings'])} warning(s):")
                 for warning in result['warnings']:
-                    print(f"  • {warning}")
+                    console.line(f"  • {warning}")
             
             print_success("✓ Validation passed - file is valid ROI-DSL")
             
             if verbose:
-                print("\nFile contents:")
-                print(f"  • {len(ast.goals)} GOALs")
-                print(f"  • {len(ast.metrics)} METRICs")
-                print(f"  • {len(ast.rmetrics)} RMetrics")
-                print(f"  • {len(ast.triggers)} Triggers")
-                print(f"  • Output: {ast.output}")
+                console.line("\nFile contents:")
+                console.line(f"  • {len(ast.goals)} GOALs")
+                console.line(f"  • {len(ast.metrics)} METRICs")
+                console.line(f"  • {len(ast.rmetrics)} RMetrics")
+                console.line(f"  • {len(ast.triggers)} Triggers")
+                console.line(f"  • Output: {ast.output}")
             
             return True
             
         except Exception as e:
             print_error(f"Validation failed: {e}")
             if verbose:
-                import traceback
-                print(traceback.format_exc())
+                console.line(traceback.format_exc())
             return False
     
+    @_flushes_console
     def preview_file(self, input_file: str):
         """Preview what a .roi file will generate"""
         print_header("ROI-DSL Preview")
@@ -396,44 +527,38 @@ class ROICompilerCLI:
             return False
         
         try:
-            with open(input_file, 'r') as f:
-                roi_content = f.read()
+            roi_content, source_digest = _read_source(input_file)
             
-            from compiler.parser import ROIDSLParser
-            from compiler.interpreter import ROIInterpreter
+            ast = self.ast_cache.parse(roi_content, source_digest)
             
-            parser = ROIDSLParser(roi_content)
-            ast = parser.parse()
-            
-            interpreter = ROIInterpreter(ast)
-            analysis = interpreter.analyze()
+            analysis = self.ast_cache.analyze(ast, source_digest)
             
             # Display preview
-            print(f"{Colors.BOLD}Persona:{Colors.ENDC} {analysis.get('persona', 'N/A')}")
-            print(f"\n{Colors.BOLD}Goals:{Colors.ENDC}")
+            console.line(f"{Colors.BOLD}Persona:{Colors.ENDC} {analysis.get('persona', 'N/A')}")
+            console.line(f"\n{Colors.BOLD}Goals:{Colors.ENDC}")
             for goal in ast.goals:
-                print(f"  • {goal.name}: {goal.value}")
+                console.line(f"  • {goal.name}: {goal.value}")
             
-            print(f"\n{Colors.BOLD}Metrics:{Colors.ENDC}")
+            console.line(f"\n{Colors.BOLD}Metrics:{Colors.ENDC}")
             for metric in ast.metrics:
-                print(f"  • {metric.name}: {metric.value}")
+                console.line(f"  • {metric.name}: {metric.value}")
             
             if ast.rmetrics:
-                print(f"\n{Colors.BOLD}Computed Metrics:{Colors.ENDC}")
+                console.line(f"\n{Colors.BOLD}Computed Metrics:{Colors.ENDC}")
                 for rmetric in ast.rmetrics:
-                    print(f"  • {rmetric.name}: {rmetric.expr}")
+                    console.line(f"  • {rmetric.name}: {rmetric.expr}")
             
             if ast.triggers:
-                print(f"\n{Colors.BOLD}Automation Triggers:{Colors.ENDC}")
+                console.line(f"\n{Colors.BOLD}Automation Triggers:{Colors.ENDC}")
                 for trigger in ast.triggers:
-                    print(f"  • WHEN {trigger.condition} THEN {trigger.action}")
+                    console.line(f"  • WHEN {trigger.condition} THEN {trigger.action}")
             
-            print(f"\n{Colors.BOLD}Output Type:{Colors.ENDC} {ast.output}")
+            console.line(f"\n{Colors.BOLD}Output Type:{Colors.ENDC} {ast.output}")
             
-            print(f"\n{Colors.BOLD}Will Generate:{Colors.ENDC}")
+            console.line(f"\n{Colors.BOLD}Will Generate:{Colors.ENDC}")
             outputs = self._get_outputs_from_ast(ast)
             for output in outputs:
-                print(f"  📄 {output}/")
+                console.line(f"  📄 {output}/")
             
             return True
             
@@ -441,6 +566,7 @@ class ROICompilerCLI:
             print_error(f"Preview failed: {e}")
             return False
     
+    @_flushes_console
     def watch_file(self, input_file: str, interval: int = 2):
         """Watch a .roi file and recompile on changes"""
         print_header("ROI-DSL Watch Mode")
@@ -451,28 +577,92 @@ class ROICompilerCLI:
             print_error(f"Input file not found: {input_file}")
             return False
         
-        last_modified = os.path.getmtime(input_file)
+        target = os.path.abspath(input_file)
         
         # Initial compilation
         self.compile_file(input_file, verbose=False)
+        last_digest = self._file_digest(target)
         
         try:
-            while True:
-                time.sleep(interval)
-                current_modified = os.path.getmtime(input_file)
+            for _ in self._iter_file_changes(target, interval):
+                # Editors often touch or rewrite a file without changing it
+                digest = self._file_digest(target)
+                if digest is None or digest == last_digest:
+                    continue
                 
-                if current_modified != last_modified:
-                    print(f"\n{Colors.WARNING}⟳ File changed - recompiling...{Colors.ENDC}\n")
-                    self.compile_file(input_file, verbose=False)
-                    last_modified = current_modified
+                console.line(f"\n{Colors.WARNING}⟳ File changed - recompiling...{Colors.ENDC}\n")
+                self.compile_file(input_file, verbose=False)
+                last_digest = digest
                     
         except KeyboardInterrupt:
-            print(f"\n\n{Colors.OKGREEN}Watch mode stopped{Colors.ENDC}")
+            console.line(f"\n\n{Colors.OKGREEN}Watch mode stopped{Colors.ENDC}")
             return True
+    
+    def _iter_file_changes(self, target: str, interval: int):
+        """Yield once per burst of filesystem changes to target"""
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            Observer = None
+        
+        if Observer is None:
+            # pip install roi-dsl-compiler[watch] for event-driven watching
+            print_info(f"watchdog not installed - polling every {interval}s")
+            console.flush()
+            # Integer mtime plus size catches edits within float mtime resolution
+            st = os.stat(target)
+            last_signature = (st.st_mtime_ns, st.st_size)
+            while True:
+                time.sleep(interval)
+                try:
+                    st = os.stat(target)
+                except OSError:
+                    # Mid-save rename; check again next interval
+                    continue
+                signature = (st.st_mtime_ns, st.st_size)
+                if signature != last_signature:
+                    last_signature = signature
+                    yield
+        
+        events = queue.Queue()
+        
+        class _TargetHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                # Opened/closed events fire on our own reads; only writes matter
+                if event.is_directory or event.event_type not in _WATCH_EVENT_TYPES:
+                    return
+                paths = (event.src_path, getattr(event, 'dest_path', ''))
+                if any(p and os.path.abspath(p) == target for p in paths):
+                    events.put(event.event_type)
+        
+        observer = Observer()
+        observer.schedule(_TargetHandler(), os.path.dirname(target), recursive=False)
+        observer.start()
+        try:
+            while True:
+                events.get()
+                # Coalesce the burst: wait until no event arrives for the window
+                while True:
+                    try:
+                        events.get(timeout=_WATCH_DEBOUNCE_SECONDS)
+                    except queue.Empty:
+                        break
+                yield
+        finally:
+            observer.stop()
+            observer.join()
+    
+    def _file_digest(self, path: str) -> Optional[str]:
+        """Digest of a file's bytes, or None if it cannot be read right now"""
+        try:
+            with open(path, 'rb') as f:
+                return digest(f.read())
+        except OSError:
+            return None
 
-
-def main():
-    """Main CLI entry point"""
+def _build_parser() -> argparse.ArgumentParser:
+    """Argument parser for the compile, validate and preview commands"""
     parser = argparse.ArgumentParser(
         description='ROI-DSL Compiler v2.1 - Compile value-first DSL into downstream assets',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -481,6 +671,7 @@ Examples:
   roi compile example.roi                    # Compile ROI-DSL file
   roi compile example.roi --verbose          # Show detailed compilation
   roi compile example.roi --output mintsite  # Generate only MintSite
+  roi compile example.roi -o rmetrics-msgpack # RMetrics as MessagePack
   roi compile example.roi --dry-run          # Validate without output
   roi validate example.roi                   # Validate syntax only
   roi preview example.roi                    # Preview outputs
@@ -493,7 +684,7 @@ Examples:
     # Compile command
     compile_parser = subparsers.add_parser('compile', help='Compile ROI-DSL file')
     compile_parser.add_argument('input', help='Input .roi file path')
-    compile_parser.add_argument('--output', '-o', choices=['mintsite', 'campaigns', 'agents', 'rmetrics', 'vroi', 'skills', 'cloudflare', 'sdr'],
+    compile_parser.add_argument('--output', '-o', choices=['mintsite', 'campaigns', 'agents', 'rmetrics', 'rmetrics-msgpack', 'vroi', 'skills', 'cloudflare', 'sdr'],
                                help='Specific output type to generate')
     compile_parser.add_argument('--verbose', '-v', action='store_true', help='Show detailed compilation steps')
     compile_parser.add_argument('--dry-run', '-d', action='store_true', help='Validate without generating outputs')
@@ -508,10 +699,19 @@ Examples:
     preview_parser = subparsers.add_parser('preview', help='Preview compilation outputs')
     preview_parser.add_argument('input', help='Input .roi file path')
     
-    args = parser.parse_args()
+    return parser
+
+
+# Built once at import and shared by every main() call in this process
+_PARSER = _build_parser()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main CLI entry point (argv defaults to sys.argv[1:])"""
+    args = _PARSER.parse_args(argv)
     
     if not args.command:
-        parser.print_help()
+        _PARSER.print_help()
         return
     
     cli = ROICompilerCLI()
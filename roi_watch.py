@@ -1,22 +1,50 @@
 # roi_watch.py
 import time
+import threading
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
-import subprocess
 import os
 
+from roi_compile import ROICompilerCLI
+
 # Folder to watch
 WATCH_DIR = os.path.join(os.getcwd(), "examples")
 
+# A single save fires several events (temp file, rename, chmod); compile once
+# the file has been quiet for this long
+DEBOUNCE_SECONDS = 0.3
+
 class ROIScriptHandler(FileSystemEventHandler):
+    def __init__(self):
+        super().__init__()
+        self.cli = ROICompilerCLI()
+        self._timers = {}
+        self._timers_lock = threading.Lock()
+        # Compiles of different files share the output directory
+        self._compile_lock = threading.Lock()
+
     def on_modified(self, event):
         if event.src_path.endswith(".roi"):
-            print(f"🔄 Change detected: {event.src_path}")
-            # Call ROI-DSL compiler
-            output_dir = "cloudflare"
-            cmd = ["python", "roi_compile.py", "compile", event.src_path, "--output", output_dir]
-            subprocess.run(cmd)
-            print(f" Recompiled {os.path.basename(event.src_path)} → {output_dir}")
+            with self._timers_lock:
+                pending = self._timers.get(event.src_path)
+                if pending is not None:
+                    pending.cancel()
+                timer = threading.Timer(DEBOUNCE_SECONDS, self._do_compile, args=(event.src_path,))
+                timer.daemon = True
+                self._timers[event.src_path] = timer
+                timer.start()
+
+    def _do_compile(self, src_path):
+        with self._timers_lock:
+            # A newer event may already have scheduled a replacement timer
+            if self._timers.get(src_path) is threading.current_thread():
+                del self._timers[src_path]
+        print(f"🔄 Change detected: {src_path}")
+        # Call ROI-DSL compiler in this process
+        output_dir = "cloudflare"
+        with self._compile_lock:
+            self.cli.compile_file(src_path, [output_dir])
+        print(f" Recompiled {os.path.basename(src_path)} → {output_dir}")
 
 if __name__ == "__main__":
     observer = Observer()
@@ -3,11 +3,27 @@ ROI-DSL Compiler v2.1
 Setup configuration
 """
 
+import os
+
 from setuptools import setup, find_packages
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
 
+# Opt-in ahead-of-time build of the transpilers with mypyc:
+#   ROI_DSL_MYPYC=1 pip install .
+# Without the flag (or without mypyc) the package stays pure Python.
+ext_modules = []
+if os.environ.get("ROI_DSL_MYPYC") == "1":
+    from mypyc.build import mypycify
+    ext_modules = mypycify([
+        "compiler/transpiler_campaign.py",
+        "compiler/transpiler_cloudflare.py",
+        "compiler/transpiler_mintsite.py",
+        "compiler/transpiler_rmetrics.py",
+        "compiler/transpiler_sdr_automation.py",
+    ])
+
 setup(
     name="roi-dsl-compiler",
     version="2.1.0",
@@ -18,6 +34,7 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/hyperaimarketing/roi-dsl",
     packages=find_packages(),
+    ext_modules=ext_modules,
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
@@ -33,6 +50,22 @@ setup(
         # Pure Python - no external dependencies required for v2.1
     ],
     extras_require={
+        # Optional faster JSON serialization and content hashing
+        "speedups": [
+            "orjson>=3.0",
+            "xxhash>=3.0",
+        ],
+        # Optional MessagePack output for RMetrics configs
+        "msgpack": [
+            "msgpack>=1.0",
+        ],
+        "mypyc": [
+            "mypy>=1.0",
+        ],
+        # Event-driven `roi compile --watch` instead of polling
+        "watch": [
+            "watchdog>=2.0",
+        ],
         "dev": [
             "pytest>=7.0",
             "black>=22.0",
@@ -4,25 +4,36 @@ Test script for ROI-DSL Compiler CLI
 Demonstrates all major CLI functions
 """
 
-import subprocess
+import contextlib
+import io
 import sys
-import os
+import traceback
 from pathlib import Path
 
-def run_command(cmd, description):
-    """Run a command and display results"""
+from roi_compile import main as roi_main
+
+def run_command(args, description):
+    """Run a command in this interpreter and display results"""
     print(f"\n{'='*70}")
     print(f"TEST: {description}")
     print(f"{'='*70}")
-    print(f"Command: {' '.join(cmd)}\n")
+    print(f"Command: roi_compile.py {' '.join(args)}\n")
     
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    # The real entry point, in-process; it exits with the command's status
+    stdout = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(stdout):
+            roi_main(args)
+        success = True
+    except SystemExit as e:
+        success = not e.code
+    except Exception:
+        success = False
+        print("STDERR:", traceback.format_exc())
     
-    print(result.stdout)
-    if result.stderr:
-        print("STDERR:", result.stderr)
+    print(stdout.getvalue())
     
-    return result.returncode == 0
+    return bool(success)
 
 def main():
     """Run test suite"""
@@ -41,50 +52,50 @@ def main():
     tests = [
         # Test 1: Validate
         (
-            ["python3", "roi_compile.py", "validate", str(example_file)],
+            ["validate", str(example_file)],
             "Validate ROI-DSL file"
         ),
         
         # Test 2: Validate with verbose
         (
-            ["python3", "roi_compile.py", "validate", str(example_file), "--verbose"],
+            ["validate", str(example_file), "--verbose"],
             "Validate with verbose output"
         ),
         
         # Test 3: Preview
         (
-            ["python3", "roi_compile.py", "preview", str(example_file)],
+            ["preview", str(example_file)],
             "Preview compilation outputs"
         ),
         
         # Test 4: Dry run compilation
         (
-            ["python3", "roi_compile.py", "compile", str(example_file), "--dry-run"],
+            ["compile", str(example_file), "--dry-run"],
             "Dry run compilation (no output files)"
         ),
         
         # Test 5: Full compilation
         (
-            ["python3", "roi_compile.py", "compile", str(example_file)],
+            ["compile", str(example_file)],
             "Full compilation"
         ),
         
         # Test 6: Compilation with verbose
         (
-            ["python3", "roi_compile.py", "compile", str(example_file), "--verbose"],
+            ["compile", str(example_file), "--verbose"],
             "Compilation with verbose output"
         ),
         
         # Test 7: Specific output type
         (
-            ["python3", "roi_compile.py", "compile", str(example_file), "--output", "mintsite"],
+            ["compile", str(example_file), "--output", "mintsite"],
             "Compile only MintSite output"
         ),
     ]
     
     results = []
-    for cmd, description in tests:
-        success = run_command(cmd, description)
+    for args, description in tests:
+        success = run_command(args, description)
         results.append((description, success))
     
     # Summary
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the ROI-DSL compiler modules
+Run with: python test_compiler.py (or pytest)
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from compiler import _ast_cache
+from compiler._ast_cache import ASTCache
+from compiler._cache import OutputCache
+from compiler.interpreter import ROIInterpreter
+from compiler.parser import GoalNode, MetricNode, ROIDSLAST, ROIDSLParser, parse_roi_file
+from compiler.transpiler_rmetrics import RMetricsTranspiler
+
+try:
+    import ormsgpack as msgpack
+except ImportError:
+    try:
+        import msgpack
+    except ImportError:
+        msgpack = None
+
+EXAMPLE_FILE = Path(__file__).parent / "examples" / "clinical_trial_sponsor.roi"
+
+
+class ParserTest(unittest.TestCase):
+    def test_splits_lines_on_newline_only(self):
+        ast = ROIDSLParser('GOAL Save: "a\u2028b\x0cc"\r\nOUTPUT MintSite\r\n').parse()
+
+        self.assertEqual(ast.goals[0].value, "a\u2028b\x0cc")
+        self.assertEqual(ast.output, "MintSite")
+
+    def test_maps_are_copies(self):
+        parser = ROIDSLParser('METRIC Risk: 0.5\nGOAL Save: "time"\n')
+        ast = parser.parse()
+        parser.get_metrics_map()['Risk'] = 1.0
+        parser.get_goals_map().clear()
+
+        self.assertEqual(parser.get_metrics_map(), {'Risk': 0.5})
+        self.assertEqual(ast.goals_by_name, {'Save': "time"})
+
+    def test_maps_index_an_ast_built_without_parse(self):
+        parser = ROIDSLParser("")
+        parser.ast = ROIDSLAST(metrics=[MetricNode("Risk", 0.5)], goals=[GoalNode("Save", "time")])
+
+        self.assertEqual(parser.get_metrics_map(), {'Risk': 0.5})
+        self.assertEqual(parser.get_goals_map(), {'Save': "time"})
+
+
+class InterpreterTest(unittest.TestCase):
+    def test_analyze_returns_a_copy(self):
+        interpreter = ROIInterpreter(parse_roi_file(str(EXAMPLE_FILE)))
+        first = interpreter.analyze()
+        first['secondary_goals'].append("mutated")
+        first['persona'] = None
+
+        second = interpreter.analyze()
+        self.assertNotIn("mutated", second['secondary_goals'])
+        self.assertIsNotNone(second['persona'])
+
+
+class ASTCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_dir = Path(tmp.name)
+        self.source = EXAMPLE_FILE.read_text(encoding='utf-8')
+
+    def entry_files(self):
+        return list(self.cache_dir.glob("*.pkl"))
+
+    def test_reuses_entry_from_disk(self):
+        ast = ASTCache(self.cache_dir).parse(self.source, "digest")
+
+        cache = ASTCache(self.cache_dir)
+        self.assertEqual(cache.parse(self.source, "digest"), ast)
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+    def test_salt_change_invalidates_entries(self):
+        ASTCache(self.cache_dir).parse(self.source, "digest")
+
+        original = _ast_cache._CACHE_SALT
+        _ast_cache._CACHE_SALT = original + "-changed"
+        self.addCleanup(setattr, _ast_cache, "_CACHE_SALT", original)
+        cache = ASTCache(self.cache_dir)
+        cache.parse(self.source, "digest")
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+    def test_corrupt_or_truncated_entry_is_a_miss(self):
+        ast = ASTCache(self.cache_dir).parse(self.source, "digest")
+        [path] = self.entry_files()
+        data = path.read_bytes()
+
+        for damaged in (data[:len(data) // 2], b"not a pickle", b""):
+            path.write_bytes(damaged)
+            cache = ASTCache(self.cache_dir)
+            self.assertEqual(cache.parse(self.source, "digest"), ast)
+            self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+    def test_store_deletes_entries_with_a_stale_salt(self):
+        stale = self.cache_dir / "digest-0.0.0-py00-stale.pkl"
+        stale.write_bytes(b"old")
+
+        ASTCache(self.cache_dir).parse(self.source, "digest")
+        self.assertFalse(stale.exists())
+        self.assertEqual(len(self.entry_files()), 1)
+
+    def test_store_keeps_only_the_newest_entries(self):
+        cache = ASTCache(self.cache_dir, max_disk_entries=2)
+        for n in range(4):
+            cache.parse(self.source, f"digest{n}")
+            [path] = self.cache_dir.glob(f"digest{n}-*.pkl")
+            os.utime(path, ns=(n * 10**9, n * 10**9))
+
+        names = sorted(p.name.split("-", 1)[0] for p in self.entry_files())
+        self.assertEqual(names, ["digest2", "digest3"])
+
+    def test_default_dir_is_per_user(self):
+        with mock.patch.dict(os.environ, {"ROI_DSL_CACHE_DIR": str(self.cache_dir)}):
+            self.assertEqual(ASTCache().cache_dir, self.cache_dir)
+        env = {"ROI_DSL_CACHE_DIR": "", "XDG_CACHE_HOME": str(self.cache_dir)}
+        with mock.patch.dict(os.environ, env), mock.patch.object(sys, "platform", "linux"):
+            self.assertEqual(ASTCache().cache_dir, self.cache_dir / "roi-dsl" / "ast")
+
+    def test_analyze_returns_a_copy(self):
+        cache = ASTCache(self.cache_dir)
+        ast = cache.parse(self.source, "digest")
+        cache.analyze(ast, "digest")['secondary_goals'].append("mutated")
+
+        self.assertNotIn("mutated", cache.analyze(ast, "digest")['secondary_goals'])
+        reloaded = ASTCache(self.cache_dir)
+        self.assertNotIn("mutated", reloaded.analyze(reloaded.parse(self.source, "digest"), "digest")['secondary_goals'])
+
+
+class OutputCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.calls = 0
+
+    def compile(self, ast):
+        self.calls += 1
+        return f"output {self.calls}"
+
+    def test_reuses_output_until_a_listed_field_changes(self):
+        cache = OutputCache(('metrics',))
+        ast = ROIDSLParser('METRIC Risk: 1\nGOAL Save: "time"\n').parse()
+        ast.metrics[0].value = 1
+
+        first = cache.get(ast, self.compile)
+        ast.goals[0].value = "money"
+        self.assertEqual(cache.get(ast, self.compile), first)
+        ast.metrics[0].value = 1.0
+        self.assertNotEqual(cache.get(ast, self.compile), first)
+        self.assertEqual(self.calls, 2)
+
+    def test_evicts_least_recently_used(self):
+        cache = OutputCache(('goals',), maxsize=2)
+        asts = [ROIDSLParser(f'GOAL Save: "{n}"').parse() for n in range(3)]
+        for ast in (asts[0], asts[1], asts[0], asts[2]):
+            cache.get(ast, self.compile)
+
+        self.assertEqual(len(cache), 2)
+        cache.get(asts[0], self.compile)
+        self.assertEqual(self.calls, 3)
+        cache.get(asts[1], self.compile)
+        self.assertEqual(self.calls, 4)
+
+
+class RMetricsTranspilerTest(unittest.TestCase):
+    @unittest.skipIf(msgpack is None, "needs ormsgpack or msgpack")
+    def test_compile_binary_matches_compile_dict(self):
+        ast = parse_roi_file(str(EXAMPLE_FILE))
+        transpiler = RMetricsTranspiler()
+
+        self.assertEqual(msgpack.unpackb(transpiler.compile_binary(ast)), transpiler.compile_dict(ast))
+
+
+if __name__ == '__main__':
+    unittest.main()